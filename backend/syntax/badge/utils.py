@@ -1,6 +1,6 @@
 from badge.models import Badge,UserBadge
 from datetime import time
-from challenge.models import Submission
+from challenge.models import UserChallengeProgress
 
 def award_badges_on_submission(submission):
     user=submission.user
@@ -16,9 +16,8 @@ def award_badges_on_submission(submission):
             UserBadge.objects.get_or_create(user=user,badge=badge)
     
     if submission.is_completed and submission.passed_test_cases==submission.total_test_cases:
-        previous_fails = Submission.objects.filter(
-            user=user, challenge=submission.challenge,
-            is_completed=False, created_at__lt=submission.created_at
+        previous_fails = UserChallengeProgress.objects.filter(
+            user=user, challenge=submission.challenge, failed_attempts__gt=0
         ).exists()
         if previous_fails:
             badge=Badge.objects.filter(title__iexact='Debugging Master',is_active=True).first()
@@ -0,0 +1,173 @@
+import logging
+import math
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+import redis
+from django.conf import settings
+
+logger=logging.getLogger(__name__)
+
+_client=None
+_lock=threading.Lock()
+_unavailable_until=0.0
+
+RETRY_SECONDS=30
+
+
+# Refills the user's bucket for the time elapsed since the last request
+# (JUDGE_USER_RATE tokens per second, capped at JUDGE_USER_BURST) and takes
+# one token. Returns {allowed, seconds until the next token}. Uses the
+# Redis clock so every web process shares one notion of time.
+TOKEN_BUCKET_SCRIPT="""
+local rate=tonumber(ARGV[1])
+local burst=tonumber(ARGV[2])
+local clock=redis.call('TIME')
+local now=tonumber(clock[1])+tonumber(clock[2])/1000000
+local state=redis.call('HMGET',KEYS[1],'tokens','ts')
+local tokens=tonumber(state[1]) or burst
+local ts=tonumber(state[2]) or now
+tokens=math.min(burst,tokens+math.max(0,now-ts)*rate)
+local allowed=0
+local wait=0
+if tokens >= 1 then
+    tokens=tokens-1
+    allowed=1
+else
+    wait=(1-tokens)/rate
+end
+redis.call('HSET',KEYS[1],'tokens',tokens,'ts',now)
+redis.call('EXPIRE',KEYS[1],math.ceil(burst/rate)+1)
+return {allowed,tostring(wait)}
+"""
+
+# Counting semaphore as a sorted set of "<lane>:<holder>" members scored
+# by lease expiry, so slots held by a crashed process free themselves
+# after the lease. A lane may always fill its own reserved slots; beyond
+# them it may only take a slot while fewer than its cap are in use and
+# enough slots stay free for the other lanes' unused reservations.
+# ARGV: capacity, lease, member, lane, lane cap, then (lane, reserved) pairs.
+SEMAPHORE_SCRIPT="""
+local capacity=tonumber(ARGV[1])
+local lease=tonumber(ARGV[2])
+local lane=ARGV[4]
+local cap=tonumber(ARGV[5])
+local clock=redis.call('TIME')
+local now=tonumber(clock[1])+tonumber(clock[2])/1000000
+redis.call('ZREMRANGEBYSCORE',KEYS[1],'-inf',now)
+local members=redis.call('ZRANGE',KEYS[1],0,-1)
+if #members >= capacity then
+    return 0
+end
+local used={}
+for _,member in ipairs(members) do
+    local holder_lane=string.match(member,'^([^:]+):')
+    used[holder_lane]=(used[holder_lane] or 0)+1
+end
+local reserved=0
+local own=0
+for k=6,#ARGV,2 do
+    local free=math.max(0,tonumber(ARGV[k+1])-(used[ARGV[k]] or 0))
+    if ARGV[k] == lane then
+        own=free
+    else
+        reserved=reserved+free
+    end
+end
+if own == 0 and (#members >= cap or #members+reserved >= capacity) then
+    return 0
+end
+redis.call('ZADD',KEYS[1],now+lease,ARGV[3])
+redis.call('EXPIRE',KEYS[1],math.ceil(lease)+1)
+return 1
+"""
+
+
+# Raised when a request is over its user's rate or its language has no
+# free execution slot; `retry_after` is in whole seconds.
+class AdmissionDenied(Exception):
+
+    def __init__(self,message,retry_after):
+        super().__init__(message)
+        self.retry_after=retry_after
+
+
+def get_client():
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client=redis.Redis.from_url(
+                    settings.JUDGE_ADMISSION_REDIS_URL,
+                    socket_connect_timeout=0.5,
+                    socket_timeout=0.5
+                )
+    return _client
+
+
+# Runs `command` against Redis and returns its result, or None when Redis
+# is unavailable. After a failure Redis is skipped for RETRY_SECONDS, so
+# an outage does not make every request wait on socket timeouts.
+def call(command):
+    global _unavailable_until
+    if time.monotonic() < _unavailable_until:
+        return None
+    try:
+        return command(get_client())
+    except redis.RedisError:
+        logger.warning("Admission control unavailable, skipping it for %s seconds",RETRY_SECONDS)
+        _unavailable_until=time.monotonic()+RETRY_SECONDS
+        return None
+
+
+# Takes one token from the user's bucket or raises AdmissionDenied.
+# Redis outages let the request through rather than blocking all judging.
+def check_user_rate(user_id):
+    result=call(lambda client: client.eval(
+        TOKEN_BUCKET_SCRIPT,1,f"judge:admission:user:{user_id}",
+        settings.JUDGE_USER_RATE,settings.JUDGE_USER_BURST
+    ))
+    if result is None:
+        return
+    allowed,wait=result
+    if not allowed:
+        raise AdmissionDenied('Too many executions, slow down',max(1,math.ceil(float(wait))))
+
+
+# Holds one of JUDGE_LANGUAGE_CONCURRENCY execution slots for `language`
+# (shared by every web process) for the duration of the block. Each lane
+# (see challenge.lanes) has JUDGE_LANE_SLOT_RESERVATIONS slots no other
+# lane can take, so busy higher lanes never starve it, and may only take
+# more while fewer than its share of the slots are in use, which keeps
+# headroom for higher lanes.
+@contextmanager
+def execution_slot(language,lane='standard'):
+    key=f"judge:admission:language:{language}"
+    holder=f"{lane}:{uuid.uuid4().hex}"
+    capacity=settings.JUDGE_LANGUAGE_CONCURRENCY
+    limit=max(1,int(capacity*settings.JUDGE_LANE_SLOT_SHARES.get(lane,1.0)))
+    reservations=[item for pair in settings.JUDGE_LANE_SLOT_RESERVATIONS.items() for item in pair]
+    acquired=call(lambda client: client.eval(
+        SEMAPHORE_SCRIPT,1,key,
+        capacity,settings.JUDGE_ADMISSION_LEASE_SECONDS,holder,lane,limit,*reservations
+    ))
+    if acquired == 0:
+        raise AdmissionDenied(f'{language} executions are at capacity, try again shortly',settings.JUDGE_ADMISSION_RETRY_SECONDS)
+    try:
+        yield
+    finally:
+        # an unreleased slot frees itself when its lease runs out
+        if acquired:
+            call(lambda client: client.zrem(key,holder))
+
+
+# Admits one inline execution: the user's rate limit, then a language slot.
+@contextmanager
+def admit(user_id,language,lane='standard'):
+    if not settings.JUDGE_ADMISSION_ENABLED:
+        yield
+        return
+    check_user_rate(user_id)
+    with execution_slot(language,lane):
+        yield
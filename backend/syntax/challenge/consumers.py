@@ -0,0 +1,19 @@
+from channels.generic.websocket import AsyncWebsocketConsumer
+import json
+
+class SubmissionConsumer(AsyncWebsocketConsumer):
+    async def connect(self):
+        user=self.scope["user"]
+        if not user.is_authenticated:
+            await self.close()
+        else:
+            self.group_name=f"submissions_{user.id}"
+            await self.channel_layer.group_add(self.group_name,self.channel_name)
+            await self.accept()
+    
+    async def disconnect(self, close_code):
+        if hasattr(self,'group_name'):
+            await self.channel_layer.group_discard(self.group_name,self.channel_name)
+    
+    async def submission_event(self,event):
+        await self.send(text_data=json.dumps(event['data']))
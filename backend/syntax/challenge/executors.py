@@ -0,0 +1,660 @@
+import hashlib
+import json
+import os
+import random
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future,ThreadPoolExecutor,FIRST_COMPLETED,wait
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from challenge import metrics
+from challenge.harness import FILE_EXTENSIONS,HARNESS_VERSION
+
+
+# Every executor returns a Piston-shaped result so the judge does not care
+# where the code ran:
+#   {'compile': {'stdout', 'stderr', 'code'}, 'run': {'stdout', 'stderr', 'code', 'signal'}}
+# 'compile' is only present for compiled languages. Stages may also report
+# 'cpu_time' and 'wall_time' (milliseconds) and peak 'memory' (bytes), as
+# recent Piston versions do, and stages stopped by the time limit have
+# 'status' 'TO' like in Piston.
+# stdout and stderr never exceed JUDGE_MAX_OUTPUT_SIZE characters: longer
+# output is cut, ends with TRUNCATION_MARKER and the stage has 'truncated'.
+# Executors with `supports_artifacts` can also compile a program once
+# (compile_artifact) and run the result many times (run_artifact).
+TRUNCATION_MARKER='\n...[output truncated]'
+
+
+def cap_output(stage):
+    limit=settings.JUDGE_MAX_OUTPUT_SIZE
+    for stream in ('stdout','stderr'):
+        text=stage.get(stream)
+        if text and len(text) > limit:
+            stage[stream]=text[:limit] + TRUNCATION_MARKER
+            stage['truncated']=True
+    return stage
+
+
+# Reports a stage's wall time and time limit hit to challenge.metrics.
+def record_stage(language,stage_name,stage):
+    if stage.get('wall_time') is not None:
+        metrics.observe(f'judge_{stage_name}_seconds',stage['wall_time']/1000,language=language)
+    if stage.get('status') == 'TO':
+        metrics.increment('judge_timeouts_total',language=language,stage=stage_name)
+
+
+class BaseExecutor:
+    supports_artifacts=False
+
+    def execute(self,language,source,stdin=''):
+        raise NotImplementedError
+
+    def compile_artifact(self,language,source):
+        raise NotImplementedError
+
+    def run_artifact(self,language,artifact_dir,stdin=''):
+        raise NotImplementedError
+
+
+# Raised for responses that say the Piston node could not run the code
+# (429, 5xx); these attempts are retried like network errors. `body` is
+# the (size capped) response body, or None when it was too large.
+class PistonUnavailable(Exception):
+
+    def __init__(self,response,body):
+        super().__init__(f'Piston returned HTTP {response.status_code}')
+        self.response=response
+        self.body=body
+
+
+# Routing state of one Piston node. Failures are observed passively from
+# real traffic: after `failure_threshold` consecutive failures the node is
+# ejected (circuit open) for `ejection_seconds`, then a single probe
+# request is let through (half-open); its outcome closes or re-opens it.
+class PistonEndpoint:
+
+    def __init__(self,url):
+        self.url=url
+        self.in_flight=0
+        self.latency=None
+        self.consecutive_failures=0
+        self.ejected_until=0.0
+        self.probing=False
+
+    def is_available(self,now,failure_threshold):
+        if self.consecutive_failures < failure_threshold:
+            return True
+        return now >= self.ejected_until and not self.probing
+
+    def status(self,now,failure_threshold):
+        if self.consecutive_failures < failure_threshold:
+            state='closed'
+        elif now >= self.ejected_until:
+            state='half-open'
+        else:
+            state='open'
+        return {
+            'url':self.url,
+            'state':state,
+            'in_flight':self.in_flight,
+            'latency':round(self.latency,3) if self.latency is not None else None,
+            'consecutive_failures':self.consecutive_failures,
+        }
+
+
+# Runs code on one or more Piston APIs: the public emkc.org instance or
+# self-hosted nodes (PISTON_URLS). Each request goes to the healthy node
+# with the lowest expected wait, in-flight requests times recent latency.
+# One keep-alive session is shared by every request thread; its
+# connection pool is sized to the concurrency limit (plus one hedge per
+# request) so parallel test cases never have to open throwaway connections.
+# Every request is bounded by (connect, read) timeouts. Executions have no
+# side effects, so failed attempts (network errors, timeouts, 429, 5xx) are
+# retried up to `max_retries` times on another node after a jittered
+# backoff; when every attempt failed, a {'message'} result is returned,
+# which the judge reports as a system error. With `hedge` on, a request
+# still running past the p95 of recent latencies (counted from when it was
+# sent) gets a duplicate on a second node and the first answer wins.
+class PistonExecutor(BaseExecutor):
+    latency_weight=0.3
+    latency_window=200
+    hedge_min_samples=20
+
+    def __init__(self,urls,failure_threshold=3,ejection_seconds=30,
+                 connect_timeout=3.05,read_timeout=20,max_retries=2,retry_backoff=0.2,hedge=False):
+        self.endpoints=[PistonEndpoint(url) for url in urls]
+        self.failure_threshold=failure_threshold
+        self.ejection_seconds=ejection_seconds
+        self.timeout=(connect_timeout,read_timeout)
+        self.max_retries=max_retries
+        self.retry_backoff=retry_backoff
+        self.hedge=hedge
+        self.latencies=deque(maxlen=self.latency_window)
+        self.hedge_pool=ThreadPoolExecutor(
+            max_workers=settings.JUDGE_MAX_CONCURRENCY,
+            thread_name_prefix='piston-hedge'
+        ) if hedge else None
+        self.hedge_slots=threading.BoundedSemaphore(settings.JUDGE_MAX_CONCURRENCY)
+        self.lock=threading.Lock()
+        self.session=requests.Session()
+        adapter=HTTPAdapter(
+            pool_connections=len(self.endpoints),
+            pool_maxsize=2*settings.JUDGE_MAX_CONCURRENCY if hedge else settings.JUDGE_MAX_CONCURRENCY
+        )
+        self.session.mount('https://',adapter)
+        self.session.mount('http://',adapter)
+
+    def execute(self,language,source,stdin=''):
+        data={
+            'language':language,
+            'version':'*',
+            'files':[
+                {
+                    'name':'main.' + FILE_EXTENSIONS[language],
+                    'content':source
+                }
+            ],
+            'stdin':stdin
+        }
+        tried=set()
+        for attempt in range(self.max_retries+1):
+            try:
+                return self.send(data,tried)
+            except PistonUnavailable as error:
+                if attempt == self.max_retries:
+                    # hand the node's own message (e.g. rate limited) to the judge
+                    try:
+                        return json.loads(error.body)
+                    except (TypeError,ValueError):
+                        return {'message':f'Code execution failed (HTTP {error.response.status_code})'}
+            except requests.RequestException as error:
+                if attempt == self.max_retries:
+                    # reported as a system error, like an unavailable node
+                    kind='timed out' if isinstance(error,requests.Timeout) else 'unreachable'
+                    return {'message':f'Code execution failed (executor {kind})'}
+            time.sleep(self.retry_backoff*(2**attempt)*random.uniform(0.5,1.5))
+
+    # One attempt, hedged when enabled and enough latencies are known.
+    # A hedged request's primary gets its own thread rather than a pool
+    # slot, so it is sent right away (an in-flight request cannot be
+    # abandoned, so the caller's thread has to stay free to take whichever
+    # answer comes first). The hedge delay counts from when the primary was
+    # sent, and no hedge is sent while every hedge slot is busy: an
+    # overloaded process gets no duplicate load.
+    def send(self,data,tried):
+        delay=self.hedge_delay()
+        if delay is None:
+            return self.post(data,tried)
+        sent=threading.Event()
+        primary=Future()
+
+        def run_primary():
+            try:
+                primary.set_result(self.post(data,tried,sent))
+            except BaseException as error:
+                primary.set_exception(error)
+            finally:
+                sent.set()
+
+        threading.Thread(target=run_primary,name='piston-primary',daemon=True).start()
+        sent.wait()
+        futures={primary}
+        done,_=wait(futures,timeout=delay)
+        if not done and self.hedge_slots.acquire(blocking=False):
+            futures.add(self.hedge_pool.submit(self.post_hedge,data,tried))
+        error=None
+        while futures:
+            done,futures=wait(futures,return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result()
+                except (PistonUnavailable,requests.RequestException) as failure:
+                    error=failure
+        raise error
+
+    def post_hedge(self,data,tried):
+        try:
+            return self.post(data,tried)
+        finally:
+            self.hedge_slots.release()
+
+    def post(self,data,tried,sent=None):
+        endpoint=self.acquire(exclude=tried)
+        tried.add(endpoint.url)
+        language=data['language']
+        start_time=time.monotonic()
+        if sent:
+            sent.set()
+        try:
+            piston_res=self.session.post(endpoint.url,json=data,timeout=self.timeout,stream=True)
+            # 429 and 5xx mean the node is overloaded or broken, not that the code failed
+            if piston_res.status_code >= 500 or piston_res.status_code == 429:
+                self.release(endpoint,ok=False)
+                metrics.increment('judge_executor_errors_total',executor='piston',language=language,kind=f'http_{piston_res.status_code}')
+                try:
+                    body=self.read_body(piston_res)
+                except requests.RequestException:
+                    body=None
+                finally:
+                    piston_res.close()
+                raise PistonUnavailable(piston_res,body)
+            body=self.read_body(piston_res)
+        except requests.RequestException as error:
+            self.release(endpoint,ok=False)
+            kind='timeout' if isinstance(error,requests.Timeout) else 'connection'
+            metrics.increment('judge_executor_errors_total',executor='piston',language=language,kind=kind)
+            raise
+        latency=time.monotonic()-start_time
+        self.release(endpoint,ok=True,latency=latency)
+        metrics.observe('judge_executor_request_seconds',latency,executor='piston',language=language)
+        if body is None:
+            metrics.increment('judge_executor_errors_total',executor='piston',language=language,kind='output_limit')
+            return {'run':{'stdout':'','stderr':'Output limit exceeded','code':None,'signal':None,'truncated':True}}
+        result=json.loads(body)
+        for stage in ('compile','run'):
+            if stage in result:
+                # 'output' repeats stdout and stderr interleaved; the judge never reads it
+                result[stage].pop('output',None)
+                cap_output(result[stage])
+                record_stage(language,stage,result[stage])
+        return result
+
+    # Reads at most JUDGE_MAX_RESPONSE_BYTES of the response, or returns
+    # None (and drops the connection) when the body is larger.
+    def read_body(self,response):
+        limit=settings.JUDGE_MAX_RESPONSE_BYTES
+        chunks=[]
+        size=0
+        for chunk in response.iter_content(chunk_size=64*1024):
+            size+=len(chunk)
+            if size > limit:
+                response.close()
+                return None
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    def hedge_delay(self):
+        if not self.hedge:
+            return None
+        with self.lock:
+            if len(self.latencies) < self.hedge_min_samples:
+                return None
+            latencies=sorted(self.latencies)
+        return latencies[int(len(latencies)*0.95)-1]
+
+    # Nodes in `exclude` (already tried for this request) are only used
+    # when no other node is available.
+    def acquire(self,exclude=()):
+        with self.lock:
+            now=time.monotonic()
+            candidates=[
+                endpoint for endpoint in self.endpoints
+                if endpoint.is_available(now,self.failure_threshold)
+            ]
+            untried=[endpoint for endpoint in candidates if endpoint.url not in exclude]
+            if untried:
+                candidates=untried
+            if not candidates:
+                # every node is ejected: try the one that comes back first
+                candidates=[min(self.endpoints,key=lambda endpoint: endpoint.ejected_until)]
+
+            known=[endpoint.latency for endpoint in self.endpoints if endpoint.latency is not None]
+            default_latency=sum(known)/len(known) if known else 1.0
+            endpoint=min(
+                candidates,
+                key=lambda endpoint: (endpoint.in_flight+1)*(endpoint.latency if endpoint.latency is not None else default_latency)
+            )
+            if endpoint.consecutive_failures >= self.failure_threshold:
+                endpoint.probing=True
+            endpoint.in_flight+=1
+            return endpoint
+
+    def release(self,endpoint,ok,latency=0.0):
+        with self.lock:
+            endpoint.in_flight-=1
+            endpoint.probing=False
+            if ok:
+                self.latencies.append(latency)
+                # fast error responses must not make a broken node look attractive
+                if endpoint.latency is None:
+                    endpoint.latency=latency
+                else:
+                    endpoint.latency+=self.latency_weight*(latency-endpoint.latency)
+                endpoint.consecutive_failures=0
+                return
+            endpoint.consecutive_failures+=1
+            if endpoint.consecutive_failures >= self.failure_threshold:
+                endpoint.ejected_until=time.monotonic()+self.ejection_seconds
+
+    def status(self):
+        with self.lock:
+            now=time.monotonic()
+            return [endpoint.status(now,self.failure_threshold) for endpoint in self.endpoints]
+
+
+# Compile and run commands for the local executor. `{file}` is the source
+# file and `{artifact}` the directory the compiled program is written to
+# (the run directory itself unless the artifact comes from the cache).
+LOCAL_TOOLCHAINS={
+    'python':{
+        'run':['python3','{file}'],
+    },
+    'javascript':{
+        'run':['node','--max-old-space-size={memory_mb}','{file}'],
+    },
+    'cpp':{
+        'compile':['g++','-O2','-std=c++17','-o','{artifact}/main','{file}'],
+        'run':['{artifact}/main'],
+    },
+    'c':{
+        'compile':['gcc','-O2','-o','{artifact}/main','{file}','-lm'],
+        'run':['{artifact}/main'],
+    },
+    'java':{
+        'compile':['javac','-d','{artifact}','{file}'],
+        'run':['java','-Xmx{memory_mb}m','-Xss64m','-cp','{artifact}','Main'],
+    },
+}
+
+# Appended to stderr when a run is stopped by one of the limits,
+# so the judge reports it as an error rather than a wrong answer.
+LIMIT_MESSAGES={
+    'timeout':'Time limit exceeded',
+    'SIGXCPU':'Time limit exceeded',
+    'SIGXFSZ':'Output limit exceeded',
+}
+
+# Runtimes that reserve far more address space than they use; their memory
+# is capped through the command line flags above instead of RLIMIT_AS.
+VIRTUAL_MEMORY_HEAVY={'javascript','java'}
+
+
+# On-disk LRU cache of compiled programs. Each entry is a directory named
+# after the hash of the harness version, language and full source, holding
+# the compiler output (binary or class files) and the compile result.
+# Entries are built in a staging directory and renamed into place, so
+# concurrent workers never see a half-written artifact.
+class ArtifactCache:
+
+    def __init__(self,root,max_entries):
+        self.root=root
+        self.max_entries=max_entries
+        os.makedirs(root,exist_ok=True)
+
+    def key(self,language,source):
+        return hashlib.sha256(f"{HARNESS_VERSION}\0{language}\0{source}".encode()).hexdigest()
+
+    def get(self,key):
+        path=os.path.join(self.root,key)
+        try:
+            with open(os.path.join(path,'compile.json')) as f:
+                compile_result=json.load(f)
+            os.utime(path)
+        except (FileNotFoundError,ValueError):
+            return None,None
+        return path,compile_result
+
+    def stage(self):
+        return tempfile.mkdtemp(prefix='.staging-',dir=self.root)
+
+    def commit(self,key,staging_dir,compile_result):
+        with open(os.path.join(staging_dir,'compile.json'),'w') as f:
+            json.dump(compile_result,f)
+        path=os.path.join(self.root,key)
+        try:
+            os.rename(staging_dir,path)
+        except OSError:
+            # another worker cached the same program first
+            shutil.rmtree(staging_dir,ignore_errors=True)
+        self.evict()
+        return path
+
+    def discard(self,staging_dir):
+        shutil.rmtree(staging_dir,ignore_errors=True)
+
+    def evict(self):
+        entries=[entry for entry in os.scandir(self.root) if entry.is_dir() and not entry.name.startswith('.')]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries)-self.max_entries]:
+            shutil.rmtree(entry.path,ignore_errors=True)
+
+
+# Runs code as a local subprocess inside a throwaway directory under
+# JUDGE_LOCAL_WORKDIR/<language>/, with rlimits on CPU time, memory,
+# output size and processes plus a wall clock timeout. Programs get a
+# minimal environment (PATH, LANG, HOME set to the run directory).
+# It is not a sandbox: programs run as the judge's own user, so they can
+# read the judge's /proc/<pid>/environ and .env file and reach the
+# database over the network. get_executor refuses to use it until runs
+# are wrapped in a namespace sandbox (dedicated uid, no network, private
+# /proc, read-only filesystem).
+# Compiled programs can be cached in an ArtifactCache and run repeatedly.
+class LocalExecutor(BaseExecutor):
+    supports_artifacts=True
+
+    def __init__(self,workdir,cpu_seconds,memory_mb,wall_seconds,output_bytes,compile_seconds,max_processes,artifact_cache=None):
+        self.workdir=workdir
+        self.cpu_seconds=cpu_seconds
+        self.memory_mb=memory_mb
+        self.wall_seconds=wall_seconds
+        self.output_bytes=output_bytes
+        self.compile_seconds=compile_seconds
+        self.max_processes=max_processes
+        self.artifact_cache=artifact_cache
+
+    def execute(self,language,source,stdin=''):
+        toolchain=LOCAL_TOOLCHAINS[language]
+        with self.run_directory(language) as run_dir:
+            file_path=self.write_source(run_dir,language,source)
+
+            result={}
+            if 'compile' in toolchain:
+                result['compile']=self.compile(language,file_path,run_dir,run_dir)
+                if result['compile']['code'] != 0:
+                    return result
+
+            result['run']=self.run(language,file_path,run_dir,run_dir,stdin=stdin)
+            return result
+
+    # Returns (artifact_dir, compile_result); artifact_dir is None when
+    # compilation failed. Successful builds are served from the cache.
+    def compile_artifact(self,language,source):
+        cache=self.artifact_cache
+        key=cache.key(language,source)
+        artifact_dir,compile_result=cache.get(key)
+        if artifact_dir:
+            return artifact_dir,compile_result
+
+        staging_dir=cache.stage()
+        with self.run_directory(language) as build_dir:
+            file_path=self.write_source(build_dir,language,source)
+            compile_result=self.compile(language,file_path,build_dir,staging_dir)
+        if compile_result['code'] != 0:
+            cache.discard(staging_dir)
+            return None,compile_result
+        return cache.commit(key,staging_dir,compile_result),compile_result
+
+    def run_artifact(self,language,artifact_dir,stdin=''):
+        with self.run_directory(language) as run_dir:
+            return {'run':self.run(language,None,run_dir,artifact_dir,stdin=stdin)}
+
+    def run_directory(self,language):
+        language_dir=os.path.join(self.workdir,language)
+        os.makedirs(language_dir,exist_ok=True)
+        return tempfile.TemporaryDirectory(dir=language_dir)
+
+    def write_source(self,run_dir,language,source):
+        file_path=os.path.join(run_dir,'main.' + FILE_EXTENSIONS[language])
+        with open(file_path,'w') as f:
+            f.write(source)
+        return file_path
+
+    def compile(self,language,file_path,run_dir,artifact_dir):
+        result=self.run_command(
+            self.format_command(LOCAL_TOOLCHAINS[language]['compile'],file_path,artifact_dir),
+            run_dir,
+            cpu_seconds=self.compile_seconds,
+            wall_seconds=self.compile_seconds,
+            limit_memory=False,
+            limit_files=False
+        )
+        record_stage(language,'compile',result)
+        return result
+
+    def run(self,language,file_path,run_dir,artifact_dir,stdin=''):
+        result=self.run_command(
+            self.format_command(LOCAL_TOOLCHAINS[language]['run'],file_path,artifact_dir),
+            run_dir,
+            cpu_seconds=self.cpu_seconds,
+            wall_seconds=self.wall_seconds,
+            limit_memory=language not in VIRTUAL_MEMORY_HEAVY,
+            limit_files=True,
+            stdin=stdin
+        )
+        record_stage(language,'run',result)
+        return result
+
+    def format_command(self,command,file_path,artifact_dir):
+        return [part.format(file=file_path,artifact=artifact_dir,memory_mb=self.memory_mb) for part in command]
+
+    # Prefixes the command with prlimit(1), which sets the rlimits on
+    # itself and then execs the program. Setting them in a preexec_fn is
+    # not safe once the judge runs thread pools. RLIMIT_NPROC counts every
+    # process of the judge's user, so run the judge as a dedicated user.
+    def limit_command(self,command,cpu_seconds,limit_memory,limit_files):
+        limits=[f"--cpu={cpu_seconds}:{cpu_seconds+1}",'--core=0',f"--nproc={self.max_processes}"]
+        if limit_files:
+            limits.append(f"--fsize={self.output_bytes}")
+        if limit_memory:
+            limits.append(f"--as={self.memory_mb*1024*1024}")
+        return ['prlimit',*limits,'--',*command]
+
+    def run_command(self,command,run_dir,cpu_seconds,wall_seconds,limit_memory,limit_files,stdin=''):
+        if not shutil.which(command[0]):
+            return {'stdout':'','stderr':f"{command[0]} is not installed on this judge",'code':127,'signal':None}
+        env={
+            'PATH':os.environ.get('PATH',os.defpath),
+            'LANG':'C.UTF-8',
+            'HOME':run_dir
+        }
+
+        # stdout/stderr go to files so RLIMIT_FSIZE caps how much a
+        # program can print; the judge only ever reads the capped files.
+        stdin_path=os.path.join(run_dir,'.stdin')
+        stdout_path=os.path.join(run_dir,'.stdout')
+        stderr_path=os.path.join(run_dir,'.stderr')
+        with open(stdin_path,'w') as stdin_file:
+            stdin_file.write(stdin)
+
+        timed_out=False
+        start_time=time.monotonic()
+        with open(stdin_path,'rb') as stdin_file,open(stdout_path,'wb') as stdout_file,open(stderr_path,'wb') as stderr_file:
+            try:
+                process=subprocess.Popen(
+                    self.limit_command(command,cpu_seconds,limit_memory,limit_files),
+                    cwd=run_dir,
+                    env=env,
+                    stdin=stdin_file,
+                    stdout=stdout_file,
+                    stderr=stderr_file,
+                    start_new_session=True
+                )
+            except FileNotFoundError:
+                return {'stdout':'','stderr':"prlimit is not installed on this judge",'code':127,'signal':None}
+
+            # wait4 reaps the child together with its own CPU usage, which
+            # stays correct with several runs in flight at once. Its
+            # ru_maxrss would include the forked judge process, so peak
+            # memory is sampled from the program's VmHWM while it runs.
+            deadline=start_time+wall_seconds
+            interval=0.001
+            peak_memory=None
+            while True:
+                pid,wait_status,usage=os.wait4(process.pid,os.WNOHANG)
+                if pid:
+                    break
+                peak_memory=max(filter(None,[peak_memory,self.read_peak_memory(process.pid)]),default=None)
+                if time.monotonic() >= deadline:
+                    timed_out=True
+                    os.killpg(process.pid,signal.SIGKILL)
+                    _,wait_status,usage=os.wait4(process.pid,0)
+                    break
+                time.sleep(interval)
+                interval=min(interval*2,0.02)
+            process.returncode=os.waitstatus_to_exitcode(wait_status)
+        wall_time=time.monotonic()-start_time
+
+        stdout=self.read_output(stdout_path)
+        stderr=self.read_output(stderr_path)
+        code=process.returncode
+        signal_name=signal.Signals(-code).name if code < 0 else None
+
+        limit_message=LIMIT_MESSAGES.get('timeout' if timed_out else signal_name)
+        if limit_message:
+            stderr=(stderr + "\n" if stderr else '') + limit_message
+        result={
+            'stdout':stdout,
+            'stderr':stderr,
+            'code':code,
+            'signal':signal_name,
+            'cpu_time':round((usage.ru_utime+usage.ru_stime)*1000,3),
+            'wall_time':round(wall_time*1000,3),
+            'memory':peak_memory
+        }
+        if limit_message == LIMIT_MESSAGES['timeout']:
+            result['status']='TO'
+        return cap_output(result)
+
+    # Peak resident memory in bytes of a running process (Linux), or None
+    # once it has exited.
+    def read_peak_memory(self,pid):
+        try:
+            with open(f'/proc/{pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        return int(line.split()[1])*1024
+        except (OSError,ValueError):
+            pass
+        return None
+
+    def read_output(self,path):
+        with open(path,'rb') as f:
+            return f.read(self.output_bytes).decode('utf-8',errors='replace')
+
+
+_executor=None
+_lock=threading.Lock()
+
+
+# Returns the process-wide executor selected by JUDGE_EXECUTOR. The web
+# and worker processes hold every secret of the app, so the unsandboxed
+# LocalExecutor is refused there.
+def get_executor():
+    global _executor
+    if settings.JUDGE_EXECUTOR == 'local':
+        raise ImproperlyConfigured(
+            "JUDGE_EXECUTOR=local runs submissions unsandboxed as the judge's user; use piston"
+        )
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor=PistonExecutor(
+                    settings.PISTON_URLS,
+                    failure_threshold=settings.PISTON_FAILURE_THRESHOLD,
+                    ejection_seconds=settings.PISTON_EJECTION_SECONDS,
+                    connect_timeout=settings.PISTON_CONNECT_TIMEOUT,
+                    read_timeout=settings.PISTON_READ_TIMEOUT,
+                    max_retries=settings.PISTON_MAX_RETRIES,
+                    retry_backoff=settings.PISTON_RETRY_BACKOFF,
+                    hedge=settings.PISTON_HEDGE_REQUESTS
+                )
+    return _executor
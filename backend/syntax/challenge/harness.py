@@ -0,0 +1,739 @@
+import json
+
+
+FILE_EXTENSIONS={
+    'python':'py',
+    'javascript':'js',
+    'cpp':'cpp',
+    'java':'java',
+    'c':'c',
+}
+
+COMPILED_LANGUAGES={'cpp','java','c'}
+
+# Part of every compiled artifact's cache key; bump it whenever the
+# generated programs change shape so stale binaries are not reused.
+HARNESS_VERSION='1'
+
+# Printed on its own line (to stdout and stderr) before every test case
+# in a batch program so the combined output can be split back per case.
+BATCH_DELIMITER='@@SYNTAX_CASE@@'
+
+
+# Builds the program that runs a single test case: the user's code
+# followed by one call to the challenge function with the case's arguments.
+def build_program(code,language,function_name,input_args):
+    if language == 'python':
+        return code.strip() + "\n" + f"\nprint({function_name}({input_args}))"
+    elif language == 'javascript':
+        return code.strip() + "\n" + f"\nconsole.log({function_name}({input_args}))"
+    elif language == 'cpp':
+        return f"""
+#include <iostream>
+using namespace std;
+
+{code.strip()}
+
+int main() {{
+    cout << {function_name}({input_args});
+    return 0;
+}}
+"""
+    elif language == 'java':
+        return f"""
+{code.strip()}
+
+class Main {{
+    public static void main(String[] args) {{
+        System.out.println({function_name}({input_args}));
+    }}
+}}
+"""
+    elif language == 'c':
+        return f"""
+#include <stdio.h>
+
+{code.strip()}
+
+int main() {{
+    printf("%d", {function_name}({input_args}));
+    return 0;
+}}
+"""
+    raise ValueError(f"unsupported language: {language}")
+
+
+# Builds one program that runs every test case in a single process.
+# Each call is preceded by BATCH_DELIMITER on stdout and stderr and is
+# guarded where the language allows, so one failing case does not hide
+# the results of the others.
+def build_batch_program(code,language,function_name,inputs_args):
+    if language == 'python':
+        calls=''.join(
+            f"""
+print("\\n{BATCH_DELIMITER}", flush=True)
+print("\\n{BATCH_DELIMITER}", file=_syntax_sys.stderr, flush=True)
+try:
+    print({function_name}({input_args}), flush=True)
+except Exception:
+    _syntax_traceback.print_exc()
+"""
+            for input_args in inputs_args
+        )
+        return code.strip() + "\n\nimport sys as _syntax_sys\nimport traceback as _syntax_traceback\n" + calls
+    elif language == 'javascript':
+        calls=''.join(
+            f"""
+console.log("\\n{BATCH_DELIMITER}");
+console.error("\\n{BATCH_DELIMITER}");
+try {{
+    console.log({function_name}({input_args}));
+}} catch (e) {{
+    console.error(e && e.stack ? e.stack : String(e));
+}}
+"""
+            for input_args in inputs_args
+        )
+        return code.strip() + "\n" + calls
+    elif language == 'cpp':
+        calls=''.join(
+            f"""
+    cout << "\\n{BATCH_DELIMITER}\\n" << flush;
+    cerr << "\\n{BATCH_DELIMITER}\\n" << flush;
+    try {{
+        cout << {function_name}({input_args}) << flush;
+    }} catch (...) {{
+        cerr << "Unhandled exception" << flush;
+    }}
+"""
+            for input_args in inputs_args
+        )
+        return f"""
+#include <iostream>
+using namespace std;
+
+{code.strip()}
+
+int main() {{{calls}
+    return 0;
+}}
+"""
+    elif language == 'java':
+        calls=''.join(
+            f"""
+        System.out.println("\\n{BATCH_DELIMITER}");
+        System.err.println("\\n{BATCH_DELIMITER}");
+        try {{
+            System.out.println({function_name}({input_args}));
+        }} catch (Throwable e) {{
+            System.err.println(e);
+        }}
+        System.out.flush();
+        System.err.flush();
+"""
+            for input_args in inputs_args
+        )
+        return f"""
+{code.strip()}
+
+class Main {{
+    public static void main(String[] args) {{{calls}
+    }}
+}}
+"""
+    elif language == 'c':
+        calls=''.join(
+            f"""
+    printf("\\n{BATCH_DELIMITER}\\n");
+    fflush(stdout);
+    fprintf(stderr, "\\n{BATCH_DELIMITER}\\n");
+    printf("%d", {function_name}({input_args}));
+    fflush(stdout);
+"""
+            for input_args in inputs_args
+        )
+        return f"""
+#include <stdio.h>
+
+{code.strip()}
+
+int main() {{{calls}
+    return 0;
+}}
+"""
+    raise ValueError(f"unsupported language: {language}")
+
+
+# Builds one program for a compiled language whose main() reads a test
+# case index from stdin and runs only that case. It is compiled once and
+# then executed once per test case.
+def build_dispatch_program(code,language,function_name,inputs_args):
+    if language == 'cpp':
+        cases=''.join(
+            f"""
+        case {i}: cout << {function_name}({input_args}); break;"""
+            for i,input_args in enumerate(inputs_args)
+        )
+        return f"""
+#include <iostream>
+using namespace std;
+
+{code.strip()}
+
+int main() {{
+    int _syntax_case = -1;
+    cin >> _syntax_case;
+    switch (_syntax_case) {{{cases}
+    }}
+    return 0;
+}}
+"""
+    elif language == 'java':
+        cases=''.join(
+            f"""
+            case {i}: System.out.println({function_name}({input_args})); break;"""
+            for i,input_args in enumerate(inputs_args)
+        )
+        return f"""
+{code.strip()}
+
+class Main {{
+    public static void main(String[] args) {{
+        int _syntax_case = new java.util.Scanner(System.in).nextInt();
+        switch (_syntax_case) {{{cases}
+        }}
+    }}
+}}
+"""
+    elif language == 'c':
+        cases=''.join(
+            f"""
+        case {i}: printf("%d", {function_name}({input_args})); break;"""
+            for i,input_args in enumerate(inputs_args)
+        )
+        return f"""
+#include <stdio.h>
+
+{code.strip()}
+
+int main() {{
+    int _syntax_case = -1;
+    scanf("%d", &_syntax_case);
+    switch (_syntax_case) {{{cases}
+    }}
+    return 0;
+}}
+"""
+    raise ValueError(f"unsupported language: {language}")
+
+
+# Splits the stdout/stderr of a batch run back into one entry per test case.
+# Output printed before the first delimiter (top-level prints, warnings) is
+# attached to every case, matching what a per-case run would have produced.
+# Cases that never started (e.g. after a crash) are reported as errors.
+def split_batch_output(stdout,stderr,total,fallback_error=''):
+    stdout_parts=(stdout or '').split(BATCH_DELIMITER)
+    stderr_parts=(stderr or '').split(BATCH_DELIMITER)
+    stdout_preamble=stdout_parts[0].strip()
+    stderr_preamble=stderr_parts[0].strip()
+
+    outcomes=[]
+    for i in range(1,total+1):
+        if i < len(stdout_parts):
+            case_stdout=stdout_parts[i].strip()
+            case_stderr=stderr_parts[i].strip() if i < len(stderr_parts) else ''
+            outcomes.append({
+                'stdout':'\n'.join(part for part in (stdout_preamble,case_stdout) if part),
+                'stderr':'\n'.join(part for part in (stderr_preamble,case_stderr) if part) or fallback_error,
+            })
+        else:
+            outcomes.append({
+                'stdout':'',
+                'stderr':stderr_preamble or fallback_error or 'Execution stopped before this test case ran',
+            })
+    return outcomes
+
+
+# Stdin argument protocol: the generated program reads the call arguments
+# as a JSON array from stdin and prints the return value as JSON, so the
+# same program (and the same compiled artifact) serves every test case.
+# Compiled languages need concrete parameter types, which are inferred
+# from the test case inputs; see infer_arg_types.
+
+# Returns the arguments of a test case as a list, or None when the input
+# is not JSON (e.g. a language-specific literal such as `True, None`).
+def parse_case_args(input_str):
+    try:
+        args=json.loads(f"[{input_str}]")
+    except json.JSONDecodeError:
+        return None
+    return args
+
+
+SCALAR_TYPES={'bool','int','double','string'}
+
+
+def _value_type(value):
+    if isinstance(value,bool):
+        return 'bool'
+    if isinstance(value,int):
+        return 'int'
+    if isinstance(value,float):
+        return 'double'
+    if isinstance(value,str):
+        return 'string'
+    if isinstance(value,list):
+        item_types={_value_type(item) for item in value}
+        if not item_types:
+            return '[]'
+        if item_types == {'int','double'}:
+            return 'double[]'
+        if len(item_types) == 1 and item_types <= SCALAR_TYPES:
+            return item_types.pop() + '[]'
+    return None
+
+
+def _merge_types(types):
+    types=set(types)
+    if None in types:
+        return None
+    if types == {'int','double'}:
+        return 'double'
+    if '[]' in types:
+        types.discard('[]')
+        if not types:
+            return 'int[]'
+    if types == {'int[]','double[]'}:
+        return 'double[]'
+    if len(types) == 1:
+        return types.pop()
+    return None
+
+# Parameter types each compiled language's stdin harness can read.
+SUPPORTED_ARG_TYPES={
+    'cpp':SCALAR_TYPES | {t + '[]' for t in SCALAR_TYPES},
+    'java':SCALAR_TYPES | {t + '[]' for t in SCALAR_TYPES},
+    'c':{'bool','int','double'},
+}
+
+
+# Infers one parameter type per argument position from every test case
+# ('int', 'double', 'bool', 'string' or a one-dimensional array of those,
+# e.g. 'int[]'). Returns None when the cases disagree on arity or contain
+# a value the harness cannot represent.
+def infer_arg_types(cases_args,language):
+    if not cases_args or len({len(args) for args in cases_args}) != 1:
+        return None
+    arg_types=[
+        _merge_types(_value_type(args[position]) for args in cases_args)
+        for position in range(len(cases_args[0]))
+    ]
+    supported=SUPPORTED_ARG_TYPES[language]
+    if any(arg_type not in supported for arg_type in arg_types):
+        return None
+    return arg_types
+
+
+CPP_TYPES={'int':'int','double':'double','bool':'bool','string':'string'}
+CPP_READERS={
+    'int':'(int)reader.read_int()',
+    'double':'reader.read_double()',
+    'bool':'reader.read_bool()',
+    'string':'reader.read_string()',
+}
+CPP_SUPPORT="""
+namespace syntax_harness {
+struct Reader {
+    string s;
+    size_t i = 0;
+    void ws() { while (i < s.size() && isspace((unsigned char)s[i])) i++; }
+    bool peek(char c) { ws(); return i < s.size() && s[i] == c; }
+    void expect(char c) {
+        if (!peek(c)) throw runtime_error("invalid harness input");
+        i++;
+    }
+    long long read_int() { ws(); char *end; long long v = strtoll(s.c_str() + i, &end, 10); i = end - s.c_str(); return v; }
+    double read_double() { ws(); char *end; double v = strtod(s.c_str() + i, &end); i = end - s.c_str(); return v; }
+    bool read_bool() {
+        ws();
+        if (s.compare(i, 4, "true") == 0) { i += 4; return true; }
+        if (s.compare(i, 5, "false") == 0) { i += 5; return false; }
+        throw runtime_error("invalid harness input");
+    }
+    static void append_utf8(string &out, unsigned long cp) {
+        if (cp < 0x80) { out += (char)cp; return; }
+        if (cp < 0x800) { out += (char)(0xC0 | (cp >> 6)); }
+        else if (cp < 0x10000) { out += (char)(0xE0 | (cp >> 12)); out += (char)(0x80 | ((cp >> 6) & 0x3F)); }
+        else { out += (char)(0xF0 | (cp >> 18)); out += (char)(0x80 | ((cp >> 12) & 0x3F)); out += (char)(0x80 | ((cp >> 6) & 0x3F)); }
+        out += (char)(0x80 | (cp & 0x3F));
+    }
+    // \\u escapes (surrogate pairs included) are written out as UTF-8
+    unsigned long read_code_point() {
+        unsigned long cp = stoul(s.substr(i, 4), nullptr, 16);
+        i += 4;
+        if (cp >= 0xD800 && cp < 0xDC00 && s.compare(i, 2, "\\\\u") == 0) {
+            unsigned long low = stoul(s.substr(i + 2, 4), nullptr, 16);
+            if (low >= 0xDC00 && low < 0xE000) { cp = 0x10000 + ((cp - 0xD800) << 10) + (low - 0xDC00); i += 6; }
+        }
+        return cp;
+    }
+    string read_string() {
+        expect('"');
+        string out;
+        while (i < s.size() && s[i] != '"') {
+            char c = s[i++];
+            if (c != '\\\\') { out += c; continue; }
+            char e = s[i++];
+            if (e == 'n') out += '\\n';
+            else if (e == 't') out += '\\t';
+            else if (e == 'r') out += '\\r';
+            else if (e == 'b') out += '\\b';
+            else if (e == 'f') out += '\\f';
+            else if (e == 'u') append_utf8(out, read_code_point());
+            else out += e;
+        }
+        expect('"');
+        return out;
+    }
+    template <class T, class F> vector<T> read_list(F item) {
+        vector<T> out;
+        expect('[');
+        if (peek(']')) { i++; return out; }
+        while (true) {
+            out.push_back(item());
+            if (peek(',')) { i++; continue; }
+            break;
+        }
+        expect(']');
+        return out;
+    }
+};
+
+void emit(bool v);
+void emit(char v);
+void emit(const char *v);
+void emit(const string &v);
+template <class T> void emit(const vector<T> &v);
+template <class T> void emit(const T &v) { cout << v; }
+void emit(bool v) { cout << (v ? "true" : "false"); }
+void emit(char v) { emit(string(1, v)); }
+void emit(const char *v) { emit(string(v)); }
+void emit(const string &v) {
+    cout << '"';
+    for (char c : v) {
+        if (c == '"' || c == '\\\\') cout << '\\\\' << c;
+        else if (c == '\\n') cout << "\\\\n";
+        else if (c == '\\t') cout << "\\\\t";
+        else if ((unsigned char)c < 0x20) cout << "\\\\u00" << "0123456789abcdef"[c >> 4] << "0123456789abcdef"[c & 15];
+        else cout << c;
+    }
+    cout << '"';
+}
+template <class T> void emit(const vector<T> &v) {
+    cout << '[';
+    for (size_t k = 0; k < v.size(); k++) {
+        if (k) cout << ',';
+        emit(v[k]);
+    }
+    cout << ']';
+}
+}
+"""
+
+JAVA_TYPES={'int':'int','double':'double','bool':'boolean','string':'String'}
+JAVA_READERS={
+    'int':'reader.readInt()',
+    'double':'reader.readDouble()',
+    'bool':'reader.readBool()',
+    'string':'reader.readString()',
+}
+JAVA_SUPPORT="""
+class SyntaxHarness {
+    private final String s;
+    private int i = 0;
+
+    SyntaxHarness(String s) { this.s = s; }
+
+    void ws() { while (i < s.length() && Character.isWhitespace(s.charAt(i))) i++; }
+
+    boolean peek(char c) { ws(); return i < s.length() && s.charAt(i) == c; }
+
+    void expect(char c) {
+        if (!peek(c)) throw new IllegalArgumentException("invalid harness input");
+        i++;
+    }
+
+    String number() {
+        ws();
+        int start = i;
+        while (i < s.length() && "+-0123456789.eE".indexOf(s.charAt(i)) >= 0) i++;
+        return s.substring(start, i);
+    }
+
+    int readInt() { return Integer.parseInt(number()); }
+
+    double readDouble() { return Double.parseDouble(number()); }
+
+    boolean readBool() {
+        ws();
+        if (s.startsWith("true", i)) { i += 4; return true; }
+        if (s.startsWith("false", i)) { i += 5; return false; }
+        throw new IllegalArgumentException("invalid harness input");
+    }
+
+    String readString() {
+        expect('"');
+        StringBuilder out = new StringBuilder();
+        while (i < s.length() && s.charAt(i) != '"') {
+            char c = s.charAt(i++);
+            if (c != '\\\\') { out.append(c); continue; }
+            char e = s.charAt(i++);
+            if (e == 'n') out.append('\\n');
+            else if (e == 't') out.append('\\t');
+            else if (e == 'r') out.append('\\r');
+            else if (e == 'b') out.append('\\b');
+            else if (e == 'f') out.append('\\f');
+            else if (e == 'u') { out.append((char) Integer.parseInt(s.substring(i, i + 4), 16)); i += 4; }
+            else out.append(e);
+        }
+        expect('"');
+        return out.toString();
+    }
+
+    java.util.List<Object> readList(java.util.function.Supplier<Object> item) {
+        java.util.List<Object> out = new java.util.ArrayList<>();
+        expect('[');
+        if (peek(']')) { i++; return out; }
+        while (true) {
+            out.add(item.get());
+            if (peek(',')) { i++; continue; }
+            break;
+        }
+        expect(']');
+        return out;
+    }
+
+    int[] readIntArray() { return readList(this::readInt).stream().mapToInt(v -> (Integer) v).toArray(); }
+
+    double[] readDoubleArray() { return readList(this::readDouble).stream().mapToDouble(v -> (Double) v).toArray(); }
+
+    boolean[] readBoolArray() {
+        java.util.List<Object> items = readList(this::readBool);
+        boolean[] out = new boolean[items.size()];
+        for (int k = 0; k < out.length; k++) out[k] = (Boolean) items.get(k);
+        return out;
+    }
+
+    String[] readStringArray() { return readList(this::readString).toArray(new String[0]); }
+
+    static String dump(Object value) {
+        if (value == null) return "null";
+        if (value instanceof String || value instanceof Character) {
+            // control and non-ASCII characters are written as JSON unicode
+            // escapes, so the output does not depend on the JVM's stdout encoding
+            StringBuilder out = new StringBuilder("\\"");
+            for (char c : value.toString().toCharArray()) {
+                if (c == '"' || c == '\\\\') out.append('\\\\').append(c);
+                else if (c == '\\n') out.append("\\\\n");
+                else if (c < 0x20 || c > 0x7e) out.append(String.format("\\\\u%04x", (int) c));
+                else out.append(c);
+            }
+            return out.append('"').toString();
+        }
+        if (value.getClass().isArray()) {
+            StringBuilder out = new StringBuilder("[");
+            for (int k = 0; k < java.lang.reflect.Array.getLength(value); k++) {
+                if (k > 0) out.append(',');
+                out.append(dump(java.lang.reflect.Array.get(value, k)));
+            }
+            return out.append(']').toString();
+        }
+        if (value instanceof Iterable) {
+            StringBuilder out = new StringBuilder("[");
+            boolean first = true;
+            for (Object item : (Iterable<?>) value) {
+                if (!first) out.append(',');
+                out.append(dump(item));
+                first = false;
+            }
+            return out.append(']').toString();
+        }
+        return value.toString();
+    }
+}
+"""
+
+C_TYPES={'int':'int','double':'double','bool':'int'}
+C_READERS={
+    'int':'(int)syntax_harness_read_int()',
+    'double':'syntax_harness_read_double()',
+    'bool':'syntax_harness_read_bool()',
+}
+C_SUPPORT="""
+static char *syntax_harness_input;
+static size_t syntax_harness_pos;
+
+static void syntax_harness_ws(void) {
+    while (syntax_harness_input[syntax_harness_pos] && isspace((unsigned char)syntax_harness_input[syntax_harness_pos])) syntax_harness_pos++;
+}
+
+static void syntax_harness_expect(char c) {
+    syntax_harness_ws();
+    if (syntax_harness_input[syntax_harness_pos] != c) {
+        fprintf(stderr, "invalid harness input\\n");
+        exit(1);
+    }
+    syntax_harness_pos++;
+}
+
+static long long syntax_harness_read_int(void) {
+    char *end;
+    long long v = strtoll(syntax_harness_input + syntax_harness_pos, &end, 10);
+    syntax_harness_pos = end - syntax_harness_input;
+    return v;
+}
+
+static double syntax_harness_read_double(void) {
+    char *end;
+    double v = strtod(syntax_harness_input + syntax_harness_pos, &end);
+    syntax_harness_pos = end - syntax_harness_input;
+    return v;
+}
+
+static int syntax_harness_read_bool(void) {
+    syntax_harness_ws();
+    if (strncmp(syntax_harness_input + syntax_harness_pos, "true", 4) == 0) { syntax_harness_pos += 4; return 1; }
+    if (strncmp(syntax_harness_input + syntax_harness_pos, "false", 5) == 0) { syntax_harness_pos += 5; return 0; }
+    fprintf(stderr, "invalid harness input\\n");
+    exit(1);
+}
+
+static void syntax_harness_read_stdin(void) {
+    size_t size = 0, capacity = 4096;
+    syntax_harness_input = malloc(capacity);
+    size_t n;
+    while ((n = fread(syntax_harness_input + size, 1, capacity - size - 1, stdin)) > 0) {
+        size += n;
+        if (size + 1 == capacity) syntax_harness_input = realloc(syntax_harness_input, capacity *= 2);
+    }
+    syntax_harness_input[size] = 0;
+}
+"""
+
+
+def _cpp_reader(arg_type):
+    if arg_type.endswith('[]'):
+        item_type=arg_type[:-2]
+        return f"reader.read_list<{CPP_TYPES[item_type]}>([&] {{ return {CPP_READERS[item_type]}; }})"
+    return CPP_READERS[arg_type]
+
+
+def _cpp_type(arg_type):
+    if arg_type.endswith('[]'):
+        return f"vector<{CPP_TYPES[arg_type[:-2]]}>"
+    return CPP_TYPES[arg_type]
+
+
+def _java_reader(arg_type):
+    if arg_type.endswith('[]'):
+        item_type=arg_type[:-2]
+        return {'int':'reader.readIntArray()','double':'reader.readDoubleArray()','bool':'reader.readBoolArray()','string':'reader.readStringArray()'}[item_type]
+    return JAVA_READERS[arg_type]
+
+
+def _java_type(arg_type):
+    if arg_type.endswith('[]'):
+        return JAVA_TYPES[arg_type[:-2]] + '[]'
+    return JAVA_TYPES[arg_type]
+
+
+# Reads each argument in turn, with a comma between them, from the
+# JSON array on stdin. `read` maps a type to the expression reading it.
+def _read_args(arg_types,declare,read,expect,indent):
+    lines=[f"{expect}('[');"]
+    for position,arg_type in enumerate(arg_types):
+        if position:
+            lines.append(f"{expect}(',');")
+        lines.append(f"{declare(arg_type)} syntax_arg{position} = {read(arg_type)};")
+    lines.append(f"{expect}(']');")
+    return ''.join(f"\n{indent}{line}" for line in lines)
+
+
+# Builds the stdin-driven program for a test case-independent harness.
+# `arg_types` is only needed for compiled languages (see infer_arg_types).
+def build_stdin_program(code,language,function_name,arg_types=None):
+    if language == 'python':
+        return code.strip() + f"""
+
+import json as _syntax_json
+import sys as _syntax_sys
+print(_syntax_json.dumps({function_name}(*_syntax_json.loads(_syntax_sys.stdin.read())), default=str))
+"""
+    elif language == 'javascript':
+        return code.strip() + f"""
+
+(() => {{
+    const args = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+    console.log(JSON.stringify({function_name}(...args)));
+}})();
+"""
+    call_args=', '.join(f"syntax_arg{position}" for position in range(len(arg_types)))
+    if language == 'cpp':
+        reads=_read_args(arg_types,_cpp_type,_cpp_reader,'reader.expect','    ')
+        return f"""
+#include <cctype>
+#include <cstdlib>
+#include <iostream>
+#include <iterator>
+#include <stdexcept>
+#include <string>
+#include <vector>
+using namespace std;
+
+{code.strip()}
+{CPP_SUPPORT}
+int main() {{
+    syntax_harness::Reader reader{{string(istreambuf_iterator<char>(cin), istreambuf_iterator<char>())}};{reads}
+    syntax_harness::emit({function_name}({call_args}));
+    return 0;
+}}
+"""
+    elif language == 'java':
+        reads=_read_args(arg_types,_java_type,_java_reader,'reader.expect','        ')
+        return f"""
+{code.strip()}
+{JAVA_SUPPORT}
+class Main {{
+    public static void main(String[] args) throws Exception {{
+        SyntaxHarness reader = new SyntaxHarness(new String(System.in.readAllBytes(), java.nio.charset.StandardCharsets.UTF_8));{reads}
+        System.out.println(SyntaxHarness.dump({function_name}({call_args})));
+    }}
+}}
+"""
+    elif language == 'c':
+        reads=_read_args(arg_types,C_TYPES.get,C_READERS.get,'syntax_harness_expect','    ')
+        return f"""
+#include <ctype.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+{code.strip()}
+{C_SUPPORT}
+int main(void) {{
+    syntax_harness_read_stdin();{reads}
+    printf("%d", {function_name}({call_args}));
+    return 0;
+}}
+"""
+    raise ValueError(f"unsupported language: {language}")
+
+
+# Turns the JSON printed by a stdin harness back into the text the judge
+# compares: JSON strings are unquoted, everything else is kept as printed.
+def decode_json_output(stdout):
+    try:
+        value=json.loads(stdout)
+    except ValueError:
+        return stdout
+    return value if isinstance(value,str) else stdout
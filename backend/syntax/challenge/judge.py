@@ -0,0 +1,592 @@
+import json
+import logging
+import threading
+import time
+from collections import Counter,OrderedDict,deque
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.cache import caches
+from challenge import metrics
+from challenge.executors import get_executor
+from challenge.harness import (
+    COMPILED_LANGUAGES,FILE_EXTENSIONS,HARNESS_VERSION,build_program,build_batch_program,build_dispatch_program,
+    build_stdin_program,split_batch_output,parse_case_args,infer_arg_types,decode_json_output
+)
+from challenge.models import SubmissionTestResult
+from challenge.result_cache import get_cached_results,cache_results
+from challenge.runtime_stats import record_runtime,is_repeat_solution
+from challenge.stats import save_judged_submission
+from challenge.utils import format_input_args,update_user_streak
+from badge.utils import award_badges_on_submission
+
+
+logger=logging.getLogger(__name__)
+
+_pool=None
+_lock=threading.Lock()
+_harnesses=OrderedDict()
+_harnesses_lock=threading.Lock()
+
+# Stands in for the user's code in precomputed program templates.
+CODE_MARKER='@@SYNTAX_CODE@@'
+
+
+# Process-wide worker pool for "concurrent" mode. Its size is the upper
+# bound on in-flight executions started by this process.
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                _pool=ThreadPoolExecutor(
+                    max_workers=settings.JUDGE_MAX_CONCURRENCY,
+                    thread_name_prefix='judge'
+                )
+    return _pool
+
+
+# Runs a single program on the configured executor (see JUDGE_EXECUTOR).
+def execute_code(language,source,stdin=''):
+    return get_executor().execute(language,source,stdin=stdin)
+
+
+# Applies `func` to every item, through the worker pool in "concurrent"
+# mode, and yields the results in the original order. Work is scheduled
+# lazily (at most JUDGE_MAX_CONCURRENCY items ahead of the consumer), so
+# a consumer that stops iterating also stops further executions.
+def run_all(func,items):
+    items=list(items)
+    if settings.JUDGE_EXECUTION_MODE == 'concurrent' and len(items) > 1:
+        return run_concurrently(func,items)
+    return (func(item) for item in items)
+
+
+def run_concurrently(func,items):
+    pool=get_pool()
+    remaining=iter(items)
+    pending=deque()
+    try:
+        for item in remaining:
+            pending.append(pool.submit(func,item))
+            if len(pending) >= settings.JUDGE_MAX_CONCURRENCY:
+                break
+        while pending:
+            result=pending.popleft().result()
+            for item in remaining:
+                pending.append(pool.submit(func,item))
+                break
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+# Runs one program once per stdin payload. Compiled languages on an
+# executor with artifact support are compiled once (and cached); the
+# compile result is attached to every run like a normal execution.
+def run_program(executor,language,source,stdins):
+    if language in COMPILED_LANGUAGES and executor.supports_artifacts:
+        artifact_dir,compile_result=executor.compile_artifact(language,source)
+        if artifact_dir is None:
+            return ({'compile':compile_result} for _ in stdins)
+        results=run_all(lambda stdin: executor.run_artifact(language,artifact_dir,stdin=stdin),stdins)
+        return (dict(result,compile=compile_result) for result in results)
+    return run_all(lambda stdin: executor.execute(language,source,stdin=stdin),stdins)
+
+
+# Builds the test case-independent stdin program and the JSON argument
+# payload of each case, or returns (None, None) when some input is not
+# plain JSON or its types cannot be expressed in the language.
+def prepare_stdin_program(code,language,function_name,cases):
+    cases_args=[parse_case_args(case['input']) for case in cases]
+    if not cases or any(args is None for args in cases_args):
+        return None,None
+    arg_types=None
+    if language in COMPILED_LANGUAGES:
+        arg_types=infer_arg_types(cases_args,language)
+        if arg_types is None:
+            return None,None
+    source=build_stdin_program(code,language,function_name,arg_types)
+    return source,[json.dumps(args) for args in cases_args]
+
+
+# Splits a program generated around CODE_MARKER into the text before and
+# after the user's code.
+def split_program(source):
+    prefix,suffix=source.split(CODE_MARKER)
+    return [prefix,suffix]
+
+
+def fill_program(template,code):
+    return template[0] + code.strip() + template[1]
+
+
+# Everything about running `cases` in `language` that does not depend on
+# the submitted code: the formatted argument literals, one program
+# template per case, the parsed expected outputs and, when the inputs
+# allow it, the stdin harness template with its JSON payloads. Plain
+# JSON-compatible data, so it can be cached and sliced per case (see
+# select_harness_cases).
+def prepare_harness(cases,language,function_name):
+    inputs_args=[format_input_args(case['input'], language) for case in cases]
+    harness={
+        'inputs_args':inputs_args,
+        'programs':[split_program(build_program(CODE_MARKER,language,function_name,input_args)) for input_args in inputs_args],
+        'expected':[prepare_expected(case['output']) for case in cases],
+        'stdin':None
+    }
+    source,payloads=prepare_stdin_program(CODE_MARKER,language,function_name,cases)
+    if source is not None:
+        harness['stdin']={'program':split_program(source),'payloads':payloads}
+    return harness
+
+
+def select_harness_cases(harness,indexes):
+    stdin=harness['stdin']
+    return {
+        'inputs_args':[harness['inputs_args'][i] for i in indexes],
+        'programs':[harness['programs'][i] for i in indexes],
+        'expected':[harness['expected'][i] for i in indexes],
+        'stdin':{
+            'program':stdin['program'],
+            'payloads':[stdin['payloads'][i] for i in indexes]
+        } if stdin else None
+    }
+
+
+def harness_cache_key(challenge,language):
+    return f"judge:harness:v2:{challenge.id}:{challenge.test_cases_version}:{HARNESS_VERSION}:{language}"
+
+
+# The prepared harness of all the challenge's test cases in `language`.
+# Looked up in a small per-process LRU, then in the "judge" cache, and
+# only built from the test cases when both miss (e.g. after eviction).
+def get_challenge_harness(challenge,language):
+    key=harness_cache_key(challenge,language)
+    with _harnesses_lock:
+        harness=_harnesses.get(key)
+        if harness is not None:
+            _harnesses.move_to_end(key)
+            return harness
+
+    try:
+        harness=caches['judge'].get(key)
+    except Exception:
+        logger.exception("judge harness cache unavailable")
+    if harness is None:
+        harness=prepare_harness(challenge.test_cases,language,challenge.function_signature.strip())
+        set_cached_harness(key,harness)
+
+    with _harnesses_lock:
+        _harnesses[key]=harness
+        while len(_harnesses) > settings.JUDGE_HARNESS_LOCAL_CACHE_SIZE:
+            _harnesses.popitem(last=False)
+    return harness
+
+
+def set_cached_harness(key,harness):
+    try:
+        caches['judge'].set(key,harness,timeout=settings.JUDGE_HARNESS_CACHE_TTL)
+    except Exception:
+        logger.exception("judge harness cache unavailable")
+
+
+# Precomputes the harness of every language the challenge offers; called
+# when a challenge is created or updated so no judge request pays for it.
+# The challenge is already saved by then, so a harness that cannot be
+# built (missing signature, malformed test case) is logged and skipped;
+# get_challenge_harness builds it lazily when it is needed.
+def store_challenge_harnesses(challenge):
+    for language in challenge.languages or FILE_EXTENSIONS:
+        if language not in FILE_EXTENSIONS:
+            continue
+        try:
+            harness=prepare_harness(challenge.test_cases,language,challenge.function_signature.strip())
+        except Exception:
+            logger.exception("Could not prepare the %s harness of challenge %s",language,challenge.id)
+            continue
+        set_cached_harness(harness_cache_key(challenge,language),harness)
+
+
+# Reduces an executor result to the stdout/stderr pair used for judging,
+# plus the run stage's cpu_time/wall_time (ms) and memory (bytes) when the
+# executor reports them, and `truncated` when its output was cut.
+# Compiler output is only reported when the program itself wrote nothing to stderr.
+# Responses that carry neither a compile nor a run stage (e.g. a Piston
+# rate limit message) are reported as errors and flagged as system errors.
+def read_result(result):
+    if 'run' not in result and 'compile' not in result:
+        return {
+            'stdout':'',
+            'stderr':result.get('message') or 'Code execution failed',
+            'system_error':True
+        }
+    run=result.get('run', {})
+    outcome={
+        'stdout':run.get('stdout', '').strip(),
+        'stderr':run.get('stderr', '') or result.get('compile', {}).get('stderr', ''),
+        'cpu_time':run.get('cpu_time'),
+        'wall_time':run.get('wall_time'),
+        'memory':run.get('memory')
+    }
+    if run.get('truncated'):
+        outcome['truncated']=True
+    return outcome
+
+
+# Runs one batch of cases as a single program and splits its output back
+# into one outcome per case.
+def run_batch(code,language,function_name,inputs_args):
+    source=build_batch_program(code,language,function_name,inputs_args)
+    result=execute_code(language,source)
+    if 'run' not in result and 'compile' not in result:
+        return [read_result(result) for _ in inputs_args]
+    return split_batch_output(
+        result.get('run', {}).get('stdout', ''),
+        result.get('run', {}).get('stderr', ''),
+        len(inputs_args),
+        fallback_error=result.get('compile', {}).get('stderr', '')
+    )
+
+
+# Runs the user's code against the given test cases and returns one outcome
+# per case, in order: {'input_args', 'stdout', 'stderr', 'passed'}.
+# In "batch" mode the cases are split into batches of JUDGE_BATCH_SIZE,
+# each run as one generated program in one execution (batches in parallel).
+# Otherwise each case runs in its own process, in parallel in "concurrent"
+# mode. With JUDGE_ARGUMENT_PROTOCOL="stdin" one program reads each case's
+# arguments from stdin; failing that, compiled languages on an executor with
+# artifact support compile one dispatch program once and run it per case,
+# and everything else executes a separate program per case.
+# `on_outcome(index, outcome)` is called for each case as soon as it is known.
+# With `max_failures` set, no further cases are started once that many have
+# failed; the rest are returned with `not_run` set. Batch mode ignores it:
+# every case has already run, so all real results are kept.
+# `harness` is the prepared harness of `cases` (see prepare_harness); it is
+# built here when not given.
+def run_test_cases(code,language,function_name,cases,on_outcome=None,max_failures=0,harness=None):
+    if harness is None:
+        harness=prepare_harness(cases,language,function_name)
+    inputs_args=harness['inputs_args']
+    executor=get_executor()
+    stdin=None
+    if settings.JUDGE_ARGUMENT_PROTOCOL == 'stdin' and settings.JUDGE_EXECUTION_MODE != 'batch':
+        stdin=harness['stdin']
+
+    if settings.JUDGE_EXECUTION_MODE == 'batch' and cases:
+        max_failures=0
+        size=settings.JUDGE_BATCH_SIZE or len(cases)
+        batches=[inputs_args[start:start+size] for start in range(0,len(cases),size)]
+        results=run_concurrently(lambda batch: run_batch(code,language,function_name,batch),batches)
+        outcomes=[outcome for batch_outcomes in results for outcome in batch_outcomes]
+    elif stdin is not None:
+        results=run_program(executor,language,fill_program(stdin['program'],code),stdin['payloads'])
+        outcomes=(read_result(result) for result in results)
+        outcomes=(dict(outcome,stdout=decode_json_output(outcome['stdout'])) for outcome in outcomes)
+    elif language in COMPILED_LANGUAGES and executor.supports_artifacts and cases:
+        source=build_dispatch_program(code,language,function_name,inputs_args)
+        results=run_program(executor,language,source,[str(i) for i in range(len(cases))])
+        outcomes=(read_result(result) for result in results)
+    else:
+        sources=[fill_program(program,code) for program in harness['programs']]
+        results=run_all(lambda source: execute_code(language,source),sources)
+        outcomes=(read_result(result) for result in results)
+
+    judged=[]
+    failures=0
+    for i,(outcome,input_args) in enumerate(zip(outcomes,inputs_args)):
+        outcome['input_args']=input_args
+        outcome['passed']=is_output_match(outcome['stdout'],harness['expected'][i])
+        judged.append(outcome)
+        if on_outcome:
+            on_outcome(i,outcome)
+        if outcome['stderr'] or not outcome['passed']:
+            failures+=1
+            if max_failures and failures >= max_failures:
+                break
+
+    for input_args in inputs_args[len(judged):]:
+        judged.append({
+            'input_args':input_args,
+            'stdout':'',
+            'stderr':'',
+            'passed':False,
+            'not_run':True
+        })
+    return judged
+
+
+# JSON value family by first character. Values of different families never
+# compare equal, and since these characters are unaffected by lower(),
+# neither do the texts (bools share the number family: True == 1).
+JSON_FAMILIES={'[':'array','{':'object','"':'string','n':'null','t':'number','f':'number','-':'number'}
+JSON_FAMILIES.update((digit,'number') for digit in '0123456789')
+
+
+# Parses an expected output once (see prepare_harness) into what
+# is_output_match needs: the text, its lowercase form and, when it is
+# JSON, the parsed value, its compact form and its value family.
+def prepare_expected(expected_output_raw):
+    text=expected_output_raw.strip()
+    expected={'text':text,'lower':text.lower(),'ascii':text.isascii(),'is_json':False}
+    try:
+        value=json.loads(text)
+    except ValueError:
+        return expected
+    expected.update(
+        is_json=True,
+        value=value,
+        compact=json.dumps(value,separators=(',',':'),ensure_ascii=False),
+        family=JSON_FAMILIES.get(text[:1])
+    )
+    return expected
+
+
+# Compares program output with a prepared expected output, structurally
+# when both sides are valid JSON and case-insensitively as text otherwise.
+# Cheap checks come first so most verdicts never parse the output: exact
+# or compact-JSON equality, a length check for ASCII text and a value
+# family check for JSON; all of them agree with the full comparison.
+def is_output_match(actual_output_raw,expected):
+    if actual_output_raw == expected['text']:
+        return True
+    if not expected['is_json']:
+        if expected['ascii'] and actual_output_raw.isascii() and len(actual_output_raw) != len(expected['text']):
+            return False
+        return actual_output_raw.lower() == expected['lower']
+    if actual_output_raw == expected['compact']:
+        return True
+    family=JSON_FAMILIES.get(actual_output_raw[:1])
+    if family and expected['family'] and family != expected['family']:
+        return False
+    try:
+        return json.loads(actual_output_raw) == expected['value']
+    except ValueError:
+        return actual_output_raw.lower() == expected['lower']
+
+
+def get_outcome_status(outcome):
+    if outcome.get('not_run'):
+        return 'not_run'
+    if outcome['stderr']:
+        return 'error'
+    return 'passed' if outcome['passed'] else 'failed'
+
+
+# Reports one executed run, submit or re-judge to challenge.metrics: the
+# time it took per language and challenge and its test cases by status.
+def record_judging(kind,challenge,language,outcomes,seconds):
+    metrics.observe('judge_request_seconds',seconds,kind=kind,language=language,challenge=challenge.id)
+    statuses=Counter(get_outcome_status(outcome) for outcome in outcomes)
+    for outcome_status,count in statuses.items():
+        metrics.increment('judge_test_cases_total',count,kind=kind,language=language,status=outcome_status)
+    metrics.increment(
+        'judge_system_errors_total',
+        sum(1 for outcome in outcomes if outcome.get('system_error')),
+        language=language
+    )
+
+
+# One SubmissionTestResult per outcome, with the executor's metrics
+# converted to seconds and KB.
+def build_test_results(submission,outcomes):
+    def seconds(milliseconds):
+        return round(milliseconds/1000,4) if milliseconds is not None else None
+
+    return [
+        SubmissionTestResult(
+            submission=submission,
+            index=i,
+            status=get_outcome_status(outcome),
+            cpu_time=seconds(outcome.get('cpu_time')),
+            wall_time=seconds(outcome.get('wall_time')),
+            memory=outcome['memory']//1024 if outcome.get('memory') is not None else None
+        )
+        for i,outcome in enumerate(outcomes)
+    ]
+
+
+# Total executor-measured run time of the executed cases in seconds, or
+# None when some case has no measurement (e.g. "batch" mode).
+def get_measured_runtime(outcomes):
+    executed=[outcome for outcome in outcomes if not outcome.get('not_run')]
+    if not executed or any(outcome.get('wall_time') is None for outcome in executed):
+        return None
+    return round(sum(outcome['wall_time'] for outcome in executed)/1000,3)
+
+
+# Number of failed test cases after which a submission stops being judged
+# (0 = run every case). A challenge's own setting overrides the global one.
+def get_fail_fast_after(challenge):
+    if challenge.fail_fast_after is not None:
+        return challenge.fail_fast_after
+    return settings.JUDGE_FAIL_FAST_AFTER
+
+
+# Turns judged outcomes into the per-case console lines of a submission.
+# Returns (console_output, passed, failed_hidden_cases).
+def report_cases(cases,outcomes):
+    console_output=[]
+    passed=0
+    failed_hidden_cases=[]
+    for i,(case,outcome) in enumerate(zip(cases,outcomes)):
+        input_args = outcome['input_args']
+        actual_output_raw = outcome['stdout']
+        expected_output_raw = case['output'].strip()
+        stderr = outcome['stderr']
+        is_passed = outcome['passed']
+
+        if outcome.get('not_run'):
+            console_output.append({
+                'type': 'warning',
+                'message': f"Test Case {i + 1} {'(Hidden)' if case.get('hidden') else ''}: NOT RUN"
+            })
+            continue
+
+        if stderr:
+            if case.get('hidden'):
+                failed_hidden_cases.append({
+                    'input':input_args,
+                    'error':stderr.strip()
+                })
+            continue
+
+        if is_passed:
+            passed+=1
+            console_output.append({
+                'type': 'success',
+                'message': f"Test Case {i + 1} {'(Hidden)' if case.get('hidden') else ''}: PASSED"
+            })
+        else:
+            if case.get('hidden'):
+                failed_hidden_cases.append({
+                    'input':input_args,
+                    'actual':actual_output_raw,
+                    'expected':expected_output_raw
+                })
+            console_output.append({
+                'type': 'error',
+                'message': f"Test Case {i + 1} {'(Hidden)' if case.get('hidden') else ''}: FAILED",
+                'details': {
+                    'input':input_args,
+                    'actual':actual_output_raw,
+                    'expected':expected_output_raw
+                }
+            })
+    
+    return console_output,passed,failed_hidden_cases
+
+
+# Judges a submission against **all** test cases (visible + hidden),
+# saves the verdict with one SubmissionTestResult per case, adds accepted
+# runtimes to the challenge's runtime histogram and applies XP, streak
+# and badge updates.
+# Accepts an unsaved Submission (inline judging) or a pending one
+# created earlier (queued judging). `on_progress(index, total, passed, hidden)`
+# is called once per finished test case.
+# Returns {'console_output', 'result_summary'}, which is also stored on the submission.
+def judge_submission(submission,on_progress=None):
+    challenge=submission.challenge
+    user=submission.user
+    code=submission.code
+    language=submission.language
+
+    function_name=challenge.function_signature.strip()
+    visible_cases=[tc for tc in challenge.test_cases]
+    total=len(visible_cases)
+
+    def report(i,outcome):
+        if on_progress:
+            on_progress(i,total,not outcome['stderr'] and outcome['passed'],bool(visible_cases[i].get('hidden')))
+
+    # Byte-identical resubmissions against unchanged test cases reuse the
+    # stored per-case verdicts (and the original runtime, so time-based
+    # badges stay honest); the submission itself is still recorded below.
+    cached=get_cached_results('submit',challenge,code,language)
+    if cached:
+        outcomes=cached['outcomes']
+        runtime=cached['runtime']
+        for i,outcome in enumerate(outcomes):
+            if not outcome.get('not_run'):
+                report(i,outcome)
+    else:
+        start_time=time.time()
+        outcomes=run_test_cases(
+            code,language,function_name,visible_cases,
+            on_outcome=report,
+            max_failures=get_fail_fast_after(challenge),
+            harness=get_challenge_harness(challenge,language)
+        )
+        end_time=time.time()
+        record_judging('submit',challenge,language,outcomes,end_time-start_time)
+        # the code's own run time when the executor measures it, otherwise
+        # the wall clock around judging (executor round trips included)
+        runtime=get_measured_runtime(outcomes)
+        if runtime is None:
+            runtime=round(end_time-start_time,2)
+        cache_results('submit',challenge,code,language,outcomes,runtime=runtime)
+
+    console_output,passed,failed_hidden_cases=report_cases(visible_cases,outcomes)
+    
+    is_completed=passed==total
+
+    submission.is_completed=is_completed
+    submission.passed_test_cases=passed
+    submission.total_test_cases=total
+    submission.runtime=runtime
+    submission.status='judged'
+    progress,already_completed=save_judged_submission(submission)
+    xp_awarded=submission.xp_awarded
+    SubmissionTestResult.objects.bulk_create(build_test_results(submission,outcomes))
+    if is_completed and runtime is not None and not is_repeat_solution(submission):
+        record_runtime(challenge,language,runtime)
+    
+    if xp_awarded:
+        user.refresh_from_db(fields=['xp'])
+        update_user_streak(user)
+    
+    award_badges_on_submission(submission)
+    
+    console_output.append({
+        'type':'info',
+        'message':f"{passed}/{total} test cases passed"
+    })
+
+    if xp_awarded:
+        console_output.append({
+            'type': 'success',
+            'message': f"🎉 {xp_awarded} XP awarded!"
+        })
+    elif is_completed and already_completed:
+        console_output.append({
+            'type': 'warning',
+            'message': "You already completed this challenge."
+        })
+    elif not is_completed:
+        console_output.append({
+            'type': 'error',
+            'message': "Challenge failed. Try fixing the issues above and submit again."
+        })
+    
+    for error in failed_hidden_cases:
+        console_output.append({
+            'type': 'error',
+            'message': 'Hidden Test Case Failed',
+            'details': error
+        })
+    
+    summary={
+        'passed':passed,
+        'total':total,
+        'is_completed':is_completed,
+        'xp_awarded':xp_awarded,
+        'already_completed':already_completed,
+        'attempts':progress.attempts
+    }
+
+    submission.result={
+        'console_output':console_output,
+        'result_summary':summary
+    }
+    submission.save(update_fields=['result'])
+    return submission.result
@@ -0,0 +1,37 @@
+from django.utils import timezone
+
+
+# Execution priority lanes, highest first. Premium users always get the
+# premium lane; submissions to a timed challenge that is currently live
+# get the contest lane; other submissions are standard and other "run"
+# requests use the run lane. Bulk re-judges (challenge.rejudge) use the
+# rejudge lane.
+LANES=('premium','contest','standard','run','rejudge')
+
+# Celery queue per lane for queued submissions and re-judges (runs are never queued).
+# Workers listen on several lane queues and the Redis transport consumes
+# them round-robin, so a busy upper lane slows the lower ones down but
+# never starves them (see the celery-judge services in docker-compose).
+LANE_QUEUES={
+    'premium':'judge_premium',
+    'contest':'judge_contest',
+    'standard':'judge',
+    'rejudge':'judge_rejudge',
+}
+
+
+def is_timed_challenge_live(challenge,now=None):
+    if not challenge.start_time or not challenge.end_time:
+        return False
+    now=now or timezone.now()
+    return challenge.start_time <= now <= challenge.end_time
+
+
+def get_lane(user,challenge,is_run=False):
+    if user.is_premium:
+        return 'premium'
+    if is_run:
+        return 'run'
+    if is_timed_challenge_live(challenge):
+        return 'contest'
+    return 'standard'
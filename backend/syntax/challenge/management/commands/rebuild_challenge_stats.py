@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from challenge.stats import rebuild_challenge_stats
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-challenge stats and per-user challenge progress from judged submissions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--challenge', type=int, help='Only rebuild the stats and progress of this challenge')
+
+    def handle(self, *args, **options):
+        stats, progress = rebuild_challenge_stats(options['challenge'])
+        self.stdout.write(self.style.SUCCESS(f'✅ Rebuilt the stats of {stats} challenges and {progress} user progress rows'))
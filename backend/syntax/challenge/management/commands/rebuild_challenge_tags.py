@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from challenge.tags import rebuild_challenge_tags
+
+class Command(BaseCommand):
+    help = 'Relink every challenge to its tags and recount the cached tag and difficulty facets'
+
+    def handle(self, *args, **options):
+        challenges, tags = rebuild_challenge_tags()
+        self.stdout.write(self.style.SUCCESS(f'✅ Relinked {challenges} challenges and recounted {tags} tags'))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from challenge.runtime_stats import rebuild_runtime_histograms
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-challenge, per-language runtime histograms from accepted submissions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--challenge', type=int, help='Only rebuild the histograms of this challenge')
+
+    def handle(self, *args, **options):
+        histograms, total = rebuild_runtime_histograms(options['challenge'])
+        self.stdout.write(self.style.SUCCESS(f'✅ Rebuilt {histograms} runtime histograms from {total} accepted submissions'))
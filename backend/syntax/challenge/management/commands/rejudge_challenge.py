@@ -0,0 +1,52 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from challenge.models import Challenge, RejudgeJob
+from challenge.rejudge import create_rejudge_job, plan_rejudge_chunks, start_rejudge_job, rejudge_chunk, fail_rejudge_chunk
+from challenge.tasks import rejudge_challenge_task
+
+class Command(BaseCommand):
+    help = "Re-judge the latest submission of every user and language of a challenge against its current test cases"
+
+    def add_arguments(self, parser):
+        parser.add_argument('challenge_id', type=int)
+        parser.add_argument('--inline', action='store_true', help='Run every chunk in this process instead of on the Celery workers')
+        parser.add_argument('--wait', action='store_true', help='Report progress until the queued re-judge finishes')
+
+    def handle(self, *args, **options):
+        try:
+            challenge = Challenge.objects.get(id=options['challenge_id'])
+        except Challenge.DoesNotExist:
+            raise CommandError(f"Challenge {options['challenge_id']} does not exist")
+
+        job = create_rejudge_job(challenge)
+        if options['inline']:
+            chunks = plan_rejudge_chunks(job)
+            start_rejudge_job(job, chunks)
+            for chunk in chunks:
+                try:
+                    rejudge_chunk(job.id, chunk)
+                except Exception as error:
+                    fail_rejudge_chunk(job.id, chunk)
+                    self.stderr.write(f'Chunk of {len(chunk)} submissions failed: {error}')
+                self.report(RejudgeJob.objects.get(id=job.id))
+        else:
+            rejudge_challenge_task.delay(job.id)
+            self.stdout.write(f'Queued re-judge job {job.id} for "{challenge.title}"')
+            if not options['wait']:
+                return
+            job.refresh_from_db()
+            while job.status == 'running':
+                time.sleep(2)
+                job.refresh_from_db()
+                self.report(job)
+
+        job.refresh_from_db()
+        if job.status == 'done':
+            self.stdout.write(self.style.SUCCESS(f'✅ Re-judged {job.processed} submissions, {job.changed} verdicts changed, {job.skipped} skipped'))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f'Re-judge job {job.id} was {job.status} after {job.processed}/{job.total} submissions ({job.failed} failed, {job.skipped} skipped)'
+            ))
+
+    def report(self, job):
+        self.stdout.write(f'{job.processed}/{job.total} submissions re-judged, {job.changed} verdicts changed')
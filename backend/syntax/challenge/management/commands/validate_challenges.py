@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from challenge.models import Challenge
+from challenge.validation import validate_challenge, suggest_time_limit
+
+class Command(BaseCommand):
+    help = "Run every challenge's reference solutions against its test cases and report mismatches and timing"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--challenge', type=int, help='Only validate this challenge')
+        parser.add_argument('--include-inactive', action='store_true', help='Also validate blocked challenges')
+
+    def handle(self, *args, **options):
+        challenges = Challenge.objects.order_by('id')
+        if options['challenge']:
+            challenges = challenges.filter(id=options['challenge'])
+        elif not options['include_inactive']:
+            challenges = challenges.filter(is_active=True)
+
+        broken = 0
+        for challenge in challenges.iterator():
+            validations = validate_challenge(challenge)
+            if not validations:
+                self.stdout.write(self.style.WARNING(f'#{challenge.id} {challenge.title}: no reference solution'))
+                continue
+
+            for validation in validations:
+                line = f'#{challenge.id} {challenge.title} [{validation.language}]: {validation.passed}/{validation.total} passed'
+                if validation.max_wall_time is not None:
+                    line += f', slowest case {validation.max_wall_time:.3f}s'
+                if validation.status == 'passed':
+                    self.stdout.write(self.style.SUCCESS(line))
+                    continue
+                self.stdout.write(self.style.ERROR(f'{line} ({validation.status})'))
+                for mismatch in validation.mismatches:
+                    self.stdout.write(
+                        f"    case {mismatch['index'] + 1}: input={mismatch['input']} "
+                        f"expected={mismatch['expected']!r} actual={mismatch['actual']!r}"
+                        + (f" error={mismatch['error']!r}" if mismatch['error'] else '')
+                    )
+            if any(validation.status != 'passed' for validation in validations):
+                broken += 1
+
+            suggested = suggest_time_limit(validations)
+            if suggested is not None and suggested != challenge.time_limit:
+                self.stdout.write(f'    time_limit is {challenge.time_limit}s, timings suggest {suggested}s')
+
+        if broken:
+            self.stdout.write(self.style.ERROR(f'{broken} challenges have failing reference solutions'))
+        else:
+            self.stdout.write(self.style.SUCCESS('✅ All reference solutions pass their test cases'))
@@ -0,0 +1,162 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+import redis
+from django.conf import settings
+
+logger=logging.getLogger(__name__)
+
+_client=None
+_lock=threading.Lock()
+_unavailable_until=0.0
+
+
+# Judge telemetry shared by every web process and Celery worker. Counters
+# and histograms live in one Redis hash per metric, keyed by the series'
+# labels, and are rendered in the Prometheus text format by
+# JudgeMetricsView. Each observation is a single pipelined round trip; when
+# Redis is down, metrics are dropped for RETRY_SECONDS rather than slowing
+# judging down.
+METRICS={
+    'judge_queue_wait_seconds':('histogram','Time a queued submission waited for a judge worker.'),
+    'judge_executor_request_seconds':('histogram','Round trip time of executor HTTP requests.'),
+    'judge_compile_seconds':('histogram','Wall time of compile stages.'),
+    'judge_run_seconds':('histogram','Wall time of run stages.'),
+    'judge_request_seconds':('histogram','Time spent judging a run, submit or re-judge.'),
+    'judge_executor_errors_total':('counter','Executor requests that failed, by kind.'),
+    'judge_timeouts_total':('counter','Executions stopped by the time limit.'),
+    'judge_system_errors_total':('counter','Test cases the executor could not run.'),
+    'judge_test_cases_total':('counter','Judged test cases by status.'),
+}
+
+# Histogram bucket upper bounds in seconds.
+BUCKETS=(0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10,30,60)
+BUCKET_LABELS=[str(bucket) for bucket in BUCKETS]+['+Inf']
+
+RETRY_SECONDS=30
+
+
+def get_client():
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client=redis.Redis.from_url(
+                    settings.JUDGE_METRICS_REDIS_URL,
+                    socket_connect_timeout=0.5,
+                    socket_timeout=0.5
+                )
+    return _client
+
+
+def metric_key(name):
+    return f"judge:metrics:{name}"
+
+
+def format_labels(labels):
+    def escape(value):
+        return str(value).replace('\\','\\\\').replace('"','\\"').replace('\n','\\n')
+    return ','.join(f'{name}="{escape(value)}"' for name,value in sorted(labels.items()))
+
+
+def write(commands):
+    global _unavailable_until
+    if not settings.JUDGE_METRICS_ENABLED or time.monotonic() < _unavailable_until:
+        return
+    try:
+        pipe=get_client().pipeline(transaction=False)
+        commands(pipe)
+        pipe.execute()
+    except redis.RedisError:
+        logger.warning("Judge metrics unavailable, dropping them for %s seconds",RETRY_SECONDS)
+        _unavailable_until=time.monotonic()+RETRY_SECONDS
+
+
+def increment(name,amount=1,**labels):
+    if amount:
+        write(lambda pipe: pipe.hincrby(metric_key(name),format_labels(labels),amount))
+
+
+# Buckets are stored non-cumulatively and summed up when rendered.
+def observe(name,seconds,**labels):
+    series=format_labels(labels)
+    bucket=next((label for bound,label in zip(BUCKETS,BUCKET_LABELS) if seconds <= bound),'+Inf')
+
+    def commands(pipe):
+        key=metric_key(name)
+        pipe.hincrby(key,f"{series}\tbucket\t{bucket}",1)
+        pipe.hincrbyfloat(key,f"{series}\tsum",seconds)
+        pipe.hincrby(key,f"{series}\tcount",1)
+    write(commands)
+
+
+def sample(name,series,value,extra=''):
+    labels=','.join(filter(None,[series,extra]))
+    return f"{name}{{{labels}}} {value}" if labels else f"{name} {value}"
+
+
+# Every metric in the Prometheus text exposition format, or None when
+# Redis is unavailable.
+def render_metrics():
+    try:
+        pipe=get_client().pipeline(transaction=False)
+        for name in METRICS:
+            pipe.hgetall(metric_key(name))
+        stored=pipe.execute()
+    except redis.RedisError:
+        logger.exception("Judge metrics unavailable")
+        return None
+
+    lines=[]
+    for (name,(kind,help_text)),values in zip(METRICS.items(),stored):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        values={field.decode():value.decode() for field,value in values.items()}
+        if kind == 'counter':
+            for series,value in sorted(values.items()):
+                lines.append(sample(name,series,value))
+            continue
+
+        parts=defaultdict(dict)
+        for field,value in values.items():
+            series,part=field.split('\t',1)
+            parts[series][part]=value
+        for series,series_parts in sorted(parts.items()):
+            cumulative=0
+            for label in BUCKET_LABELS:
+                cumulative+=int(series_parts.get(f"bucket\t{label}",0))
+                lines.append(sample(f"{name}_bucket",series,cumulative,f'le="{label}"'))
+            lines.append(sample(f"{name}_sum",series,series_parts.get('sum',0)))
+            lines.append(sample(f"{name}_count",series,series_parts.get('count',0)))
+    return '\n'.join(lines)+'\n'
+
+
+NODE_STATES=('closed','half-open','open')
+
+
+# Health of each executor node as seen by the process serving the scrape
+# (PistonExecutor.status()): breaker state, in-flight requests, latency
+# estimate and consecutive failures. Unlike the metrics above these are
+# not shared through Redis, so every process reports its own view.
+def render_node_status(nodes):
+    lines=[
+        '# HELP judge_executor_node_state Circuit breaker state of an executor node.',
+        '# TYPE judge_executor_node_state gauge',
+    ]
+    for node in nodes:
+        series=format_labels({'node':node['url']})
+        for state in NODE_STATES:
+            lines.append(sample('judge_executor_node_state',series,int(node['state'] == state),f'state="{state}"'))
+    gauges=(
+        ('judge_executor_node_in_flight','in_flight','Requests in flight to an executor node.'),
+        ('judge_executor_node_latency_seconds','latency','Smoothed request latency of an executor node.'),
+        ('judge_executor_node_consecutive_failures','consecutive_failures','Consecutive failed requests to an executor node.'),
+    )
+    for name,field,help_text in gauges:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for node in nodes:
+            if node[field] is not None:
+                lines.append(sample(name,format_labels({'node':node['url']}),node[field]))
+    return '\n'.join(lines)+'\n'
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenge', '0004_challengerequest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='result',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('judged', 'Judged'), ('failed', 'Failed')], default='judged', max_length=10),
+        ),
+    ]
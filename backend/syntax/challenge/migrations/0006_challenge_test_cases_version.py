@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenge', '0005_submission_status_result'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='challenge',
+            name='test_cases_version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenge', '0006_challenge_test_cases_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='challenge',
+            name='fail_fast_after',
+            field=models.PositiveIntegerField(blank=True, help_text='Stop judging after this many failed test cases (0 = never, empty = site default)', null=True),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenge', '0007_challenge_fail_fast_after'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='submission',
+            name='runtime',
+            field=models.FloatField(blank=True, help_text='Time taken in seconds (executor-measured run time of all test cases when available)', null=True),
+        ),
+        migrations.CreateModel(
+            name='SubmissionTestResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveSmallIntegerField()),
+                ('status', models.CharField(choices=[('passed', 'Passed'), ('failed', 'Failed'), ('error', 'Error'), ('not_run', 'Not run')], max_length=10)),
+                ('cpu_time', models.FloatField(blank=True, help_text='CPU time in seconds', null=True)),
+                ('wall_time', models.FloatField(blank=True, help_text='Wall time in seconds', null=True)),
+                ('memory', models.PositiveIntegerField(blank=True, help_text='Peak memory in KB', null=True)),
+                ('submission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='test_results', to='challenge.submission')),
+            ],
+            options={
+                'ordering': ['index'],
+                'constraints': [models.UniqueConstraint(fields=('submission', 'index'), name='unique_submission_test_result')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-18 18:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenge', '0008_submissiontestresult'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RuntimeHistogram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=30)),
+                ('counts', models.JSONField(default=list)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('challenge', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='runtime_histograms', to='challenge.challenge')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('challenge', 'language'), name='unique_runtime_histogram')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenge', '0010_rejudgejob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChallengeValidation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=30)),
+                ('test_cases_version', models.PositiveIntegerField()),
+                ('status', models.CharField(choices=[('passed', 'Passed'), ('failed', 'Failed'), ('error', 'Error')], max_length=10)),
+                ('passed', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('mismatches', models.JSONField(default=list)),
+                ('case_wall_times', models.JSONField(default=list, help_text='Wall time of each test case in seconds')),
+                ('max_wall_time', models.FloatField(blank=True, help_text='Slowest test case in seconds', null=True)),
+                ('validated_at', models.DateTimeField(auto_now=True)),
+                ('challenge', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='validations', to='challenge.challenge')),
+            ],
+            options={
+                'ordering': ['language'],
+                'constraints': [models.UniqueConstraint(fields=('challenge', 'language'), name='unique_challenge_validation')],
+            },
+        ),
+    ]
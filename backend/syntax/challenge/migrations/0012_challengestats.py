@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenge', '0011_challengevalidation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChallengeStats',
+            fields=[
+                ('challenge', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='challenge.challenge')),
+                ('attempts', models.PositiveIntegerField(default=0, help_text='Judged submissions')),
+                ('attempters', models.PositiveIntegerField(default=0, help_text='Users with a judged submission')),
+                ('solvers', models.PositiveIntegerField(default=0, help_text='Users with an accepted submission')),
+                ('success_rate', models.FloatField(default=0.0, help_text='Solvers per attempt, in percent')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
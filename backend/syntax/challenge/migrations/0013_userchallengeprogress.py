@@ -0,0 +1,80 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Fills ChallengeStats and UserChallengeProgress from existing submissions,
+# so XP is not awarded again for challenges solved before the upgrade.
+# A frozen copy of challenge.stats.build_stats as of this migration.
+def build_progress(apps, schema_editor):
+    Submission = apps.get_model('challenge', 'Submission')
+    ChallengeStats = apps.get_model('challenge', 'ChallengeStats')
+    UserChallengeProgress = apps.get_model('challenge', 'UserChallengeProgress')
+
+    stats = {}
+    progress = {}
+    submissions = Submission.objects.filter(status='judged').order_by('id').iterator(chunk_size=5000)
+    for submission in submissions:
+        challenge_id = submission.challenge_id
+        key = (submission.user_id, challenge_id)
+        if challenge_id not in stats:
+            stats[challenge_id] = ChallengeStats(challenge_id=challenge_id)
+        if key not in progress:
+            progress[key] = UserChallengeProgress(user_id=submission.user_id, challenge_id=challenge_id)
+        challenge_stats = stats[challenge_id]
+        user_progress = progress[key]
+
+        challenge_stats.attempts += 1
+        if not user_progress.attempts:
+            challenge_stats.attempters += 1
+        if submission.is_completed and user_progress.first_solved_at is None:
+            challenge_stats.solvers += 1
+        challenge_stats.success_rate = round(challenge_stats.solvers / challenge_stats.attempts * 100, 2)
+
+        user_progress.attempts += 1
+        user_progress.last_failed = not submission.is_completed
+        if not submission.is_completed:
+            user_progress.failed_attempts += 1
+            continue
+        if user_progress.first_solved_at is None:
+            user_progress.first_solved_at = submission.created_at
+        if submission.runtime is not None and (user_progress.best_runtime is None or submission.runtime < user_progress.best_runtime):
+            user_progress.best_runtime = submission.runtime
+        if submission.language not in user_progress.languages_solved:
+            user_progress.languages_solved = user_progress.languages_solved + [submission.language]
+
+    ChallengeStats.objects.all().delete()
+    ChallengeStats.objects.bulk_create(stats.values(), batch_size=1000)
+    UserChallengeProgress.objects.bulk_create(progress.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenge', '0012_challengestats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserChallengeProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attempts', models.PositiveIntegerField(default=0, help_text='Judged submissions')),
+                ('failed_attempts', models.PositiveIntegerField(default=0, help_text='Judged submissions that were not accepted')),
+                ('first_solved_at', models.DateTimeField(blank=True, null=True)),
+                ('best_runtime', models.FloatField(blank=True, help_text='Fastest accepted runtime in seconds', null=True)),
+                ('languages_solved', models.JSONField(default=list)),
+                ('last_failed', models.BooleanField(default=False, help_text='The latest judged submission was not accepted')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('challenge', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_progress', to='challenge.challenge')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='challenge_progress', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'challenge'), name='unique_user_challenge_progress')],
+            },
+        ),
+        migrations.RunPython(build_progress, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenge', '0013_userchallengeprogress'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='challenge',
+            index=models.Index(fields=['-created_at', '-id'], name='challenge_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:13
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.contrib.postgres.search
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenge', '0014_challenge_created_id_idx'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='challenge',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('title', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector(django.db.models.functions.comparison.Cast('tags', models.TextField()), config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), '||', django.contrib.postgres.search.SearchVector('description', config='english', weight='C'), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='challenge',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='challenge_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='challenge',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='challenge_title_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='challenge',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='challenge_tags_idx', opclasses=['jsonb_path_ops']),
+        ),
+    ]
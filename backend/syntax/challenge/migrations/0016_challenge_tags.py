@@ -0,0 +1,85 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:16
+
+import django.db.models.deletion
+from collections import Counter
+from django.db import migrations, models
+
+
+# Links existing challenges to Tag rows built from their `tags` lists and
+# fills the facet counts of the active ones.
+def build_tags(apps, schema_editor):
+    # a frozen copy of challenge.tags.clean_tags as of this migration
+    def clean_tags(tags):
+        names = []
+        for tag in tags or []:
+            name = str(tag).strip()
+            if name and name not in names:
+                names.append(name)
+        return names
+
+    Challenge = apps.get_model('challenge', 'Challenge')
+    Tag = apps.get_model('challenge', 'Tag')
+    ChallengeTag = apps.get_model('challenge', 'ChallengeTag')
+    ChallengeFacetCount = apps.get_model('challenge', 'ChallengeFacetCount')
+
+    challenges = [(challenge.id, challenge.difficulty, challenge.is_active, clean_tags(challenge.tags))
+                  for challenge in Challenge.objects.only('id', 'difficulty', 'is_active', 'tags')]
+    names = {name for _, _, _, tags in challenges for name in tags}
+    Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+    tag_ids = dict(Tag.objects.values_list('name', 'id'))
+
+    links = []
+    counts = Counter()
+    totals = Counter({'easy': 0, 'medium': 0, 'hard': 0})
+    for challenge_id, difficulty, is_active, tags in challenges:
+        links.extend(ChallengeTag(challenge_id=challenge_id, tag_id=tag_ids[name]) for name in tags)
+        if is_active:
+            totals[difficulty] += 1
+            counts.update((tag_ids[name], difficulty) for name in tags)
+    ChallengeTag.objects.bulk_create(links, batch_size=1000, ignore_conflicts=True)
+    ChallengeFacetCount.objects.bulk_create(
+        [ChallengeFacetCount(tag_id=tag_id, difficulty=difficulty, count=count) for (tag_id, difficulty), count in counts.items()]
+        + [ChallengeFacetCount(difficulty=difficulty, count=count) for difficulty, count in totals.items()],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenge', '0015_challenge_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ChallengeTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('challenge', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='challenge.challenge')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='challenge_links', to='challenge.tag')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('challenge', 'tag'), name='unique_challenge_tag')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ChallengeFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('difficulty', models.CharField(max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('tag', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='facet_counts', to='challenge.tag')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('tag', 'difficulty'), name='unique_challenge_facet_count')],
+            },
+        ),
+        migrations.RunPython(build_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:27
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenge', '0017_rejudge_job_failures'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='challenge',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title'), name='gin_trgm_ops'), name='challenge_title_upper_trgm_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-18 19:42
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+# Drops duplicate per-difficulty totals (tag=NULL rows) left by concurrent
+# refreshes so the constraint can be created; the next refresh recounts them.
+def drop_duplicate_totals(apps, schema_editor):
+    ChallengeFacetCount = apps.get_model('challenge', 'ChallengeFacetCount')
+    totals = ChallengeFacetCount.objects.filter(tag__isnull=True)
+    keep = totals.values('difficulty').annotate(keep_id=Min('id')).values('keep_id')
+    totals.exclude(id__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenge', '0018_challenge_title_upper_trgm_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_totals, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='challengefacetcount',
+            constraint=models.UniqueConstraint(condition=models.Q(('tag__isnull', True)), fields=('difficulty',), name='unique_challenge_facet_total'),
+        ),
+    ]
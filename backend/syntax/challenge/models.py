@@ -1,4 +1,7 @@
 from django.db import models
+from django.db.models.functions import Cast,Upper
+from django.contrib.postgres.indexes import GinIndex,OpClass
+from django.contrib.postgres.search import SearchVector,SearchVectorField
 from django.utils import timezone
 from django.conf import settings
 
@@ -23,7 +26,9 @@ class Challenge(models.Model):
     instructions=models.TextField()
     difficulty=models.CharField(max_length=20,choices=DIFFICULTY_CHOICES)
     test_cases=models.JSONField(default=list)
+    test_cases_version=models.PositiveIntegerField(default=1)
     time_limit=models.IntegerField(default=2)
+    fail_fast_after=models.PositiveIntegerField(null=True,blank=True,help_text="Stop judging after this many failed test cases (0 = never, empty = site default)")
     tags=models.JSONField(default=list)
     hints=models.JSONField(default=list)
     required_skills=models.JSONField(default=list)
@@ -37,12 +42,83 @@ class Challenge(models.Model):
     end_time=models.DateTimeField(null=True,blank=True)
     xp_reward=models.IntegerField()
     created_at=models.DateTimeField(default=timezone.now)
+    # weighted full-text document for challenge.search, kept up to date by Postgres
+    search_vector=models.GeneratedField(
+        expression=(
+            SearchVector('title',weight='A',config='english')
+            + SearchVector(Cast('tags',models.TextField()),weight='B',config='english')
+            + SearchVector('description',weight='C',config='english')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True
+    )
+
+    class Meta:
+        indexes=[
+            # keyset pagination of the challenge list (see ChallengeListView)
+            models.Index(fields=['-created_at','-id'],name='challenge_created_id_idx'),
+            GinIndex(fields=['search_vector'],name='challenge_search_vector_idx'),
+            # title word similarity searches (pg_trgm)
+            GinIndex(fields=['title'],opclasses=['gin_trgm_ops'],name='challenge_title_trgm_idx'),
+            # title__icontains, which compiles to UPPER(title) LIKE UPPER(...)
+            GinIndex(OpClass(Upper('title'),name='gin_trgm_ops'),name='challenge_title_upper_trgm_idx'),
+            # tag filtering by JSON containment (tags @> '["tag"]')
+            GinIndex(fields=['tags'],opclasses=['jsonb_path_ops'],name='challenge_tags_idx')
+        ]
 
     def __str__(self):
         return self.title
     
 
+# Normalized challenge tags. Challenge.tags stays the source of truth; the
+# ChallengeTag links and ChallengeFacetCount rows follow it (see challenge.tags).
+class Tag(models.Model):
+    name=models.CharField(max_length=255,unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class ChallengeTag(models.Model):
+    challenge=models.ForeignKey(Challenge,on_delete=models.CASCADE,related_name='tag_links')
+    tag=models.ForeignKey(Tag,on_delete=models.CASCADE,related_name='challenge_links')
+
+    class Meta:
+        constraints=[
+            models.UniqueConstraint(fields=['challenge','tag'],name='unique_challenge_tag')
+        ]
+
+
+# Cached number of active challenges per tag and difficulty; rows without
+# a tag hold the totals per difficulty. Refreshed whenever a challenge is
+# created, updated or blocked, and read by ChallengeFacetView.
+class ChallengeFacetCount(models.Model):
+    tag=models.ForeignKey(Tag,on_delete=models.CASCADE,null=True,blank=True,related_name='facet_counts')
+    difficulty=models.CharField(max_length=20)
+    count=models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints=[
+            models.UniqueConstraint(fields=['tag','difficulty'],name='unique_challenge_facet_count'),
+            # NULLs are distinct in the constraint above and nulls_distinct
+            # needs Postgres 15, so the tag=NULL totals get their own
+            models.UniqueConstraint(
+                fields=['difficulty'],
+                condition=models.Q(tag__isnull=True),
+                name='unique_challenge_facet_total'
+            )
+        ]
+
+
 class Submission(models.Model):
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('judged', 'Judged'),
+        ('failed', 'Failed'),
+    ]
+
     user=models.ForeignKey(settings.AUTH_USER_MODEL,on_delete=models.CASCADE)
     challenge=models.ForeignKey(Challenge,on_delete=models.CASCADE)
     code=models.TextField()
@@ -50,14 +126,148 @@ class Submission(models.Model):
     is_completed=models.BooleanField(default=False)
     passed_test_cases=models.PositiveIntegerField(default=0)
     total_test_cases=models.PositiveIntegerField(default=0)
-    runtime=models.FloatField(null=True, blank=True, help_text="Time taken in seconds")
+    runtime=models.FloatField(null=True, blank=True, help_text="Time taken in seconds (executor-measured run time of all test cases when available)")
     xp_awarded = models.PositiveIntegerField(default=0)
+    status=models.CharField(max_length=10,choices=STATUS_CHOICES,default='judged')
+    result=models.JSONField(null=True,blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering=['-created_at']
 
 
+# Outcome of one test case of a judged submission, as measured by the executor.
+# Rows are written in one bulk insert when the submission is judged.
+class SubmissionTestResult(models.Model):
+
+    STATUS_CHOICES = [
+        ('passed', 'Passed'),
+        ('failed', 'Failed'),
+        ('error', 'Error'),
+        ('not_run', 'Not run'),
+    ]
+
+    submission=models.ForeignKey(Submission,on_delete=models.CASCADE,related_name='test_results')
+    index=models.PositiveSmallIntegerField()
+    status=models.CharField(max_length=10,choices=STATUS_CHOICES)
+    cpu_time=models.FloatField(null=True,blank=True,help_text="CPU time in seconds")
+    wall_time=models.FloatField(null=True,blank=True,help_text="Wall time in seconds")
+    memory=models.PositiveIntegerField(null=True,blank=True,help_text="Peak memory in KB")
+
+    class Meta:
+        ordering=['index']
+        constraints=[
+            models.UniqueConstraint(fields=['submission','index'],name='unique_submission_test_result')
+        ]
+
+
+# Distribution of accepted runtimes for one challenge and language, as
+# counts per logarithmic runtime bucket (see challenge.runtime_stats).
+# Updated once per accepted submission; rebuilt with the
+# rebuild_runtime_histograms command.
+class RuntimeHistogram(models.Model):
+    challenge=models.ForeignKey(Challenge,on_delete=models.CASCADE,related_name='runtime_histograms')
+    language=models.CharField(max_length=30)
+    counts=models.JSONField(default=list)
+    total=models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints=[
+            models.UniqueConstraint(fields=['challenge','language'],name='unique_runtime_histogram')
+        ]
+
+
+# Submission counts of a challenge, updated as each submission is judged
+# (see challenge.stats) so listings never aggregate Submission. Rebuilt
+# with the rebuild_challenge_stats command and after re-judges.
+class ChallengeStats(models.Model):
+    challenge=models.OneToOneField(Challenge,on_delete=models.CASCADE,primary_key=True,related_name='stats')
+    attempts=models.PositiveIntegerField(default=0,help_text="Judged submissions")
+    attempters=models.PositiveIntegerField(default=0,help_text="Users with a judged submission")
+    solvers=models.PositiveIntegerField(default=0,help_text="Users with an accepted submission")
+    success_rate=models.FloatField(default=0.0,help_text="Solvers per attempt, in percent")
+    updated_at=models.DateTimeField(auto_now=True)
+
+
+# One user's standing on one challenge, updated with ChallengeStats as each
+# of their submissions is judged so hot paths (listings, XP, badges,
+# profile stats) read one row instead of scanning Submission.
+class UserChallengeProgress(models.Model):
+    user=models.ForeignKey(settings.AUTH_USER_MODEL,on_delete=models.CASCADE,related_name='challenge_progress')
+    challenge=models.ForeignKey(Challenge,on_delete=models.CASCADE,related_name='user_progress')
+    attempts=models.PositiveIntegerField(default=0,help_text="Judged submissions")
+    failed_attempts=models.PositiveIntegerField(default=0,help_text="Judged submissions that were not accepted")
+    first_solved_at=models.DateTimeField(null=True,blank=True)
+    best_runtime=models.FloatField(null=True,blank=True,help_text="Fastest accepted runtime in seconds")
+    languages_solved=models.JSONField(default=list)
+    last_failed=models.BooleanField(default=False,help_text="The latest judged submission was not accepted")
+    updated_at=models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints=[
+            models.UniqueConstraint(fields=['user','challenge'],name='unique_user_challenge_progress')
+        ]
+
+
+# One bulk re-judge of a challenge's latest submissions (see challenge.rejudge).
+# `processed` counts re-judged submissions as worker chunks finish; a job
+# is cancelled when the test cases change again before it is done.
+# `skipped` submissions kept their verdict because the executor could not
+# run them, `failed` ones were in chunks that kept erroring; a job with
+# failed submissions ends as failed.
+class RejudgeJob(models.Model):
+
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('cancelled', 'Cancelled'),
+        ('failed', 'Failed'),
+    ]
+
+    challenge=models.ForeignKey(Challenge,on_delete=models.CASCADE,related_name='rejudge_jobs')
+    requested_by=models.ForeignKey(settings.AUTH_USER_MODEL,on_delete=models.SET_NULL,null=True,blank=True)
+    test_cases_version=models.PositiveIntegerField()
+    status=models.CharField(max_length=10,choices=STATUS_CHOICES,default='running')
+    total=models.PositiveIntegerField(default=0)
+    processed=models.PositiveIntegerField(default=0)
+    changed=models.PositiveIntegerField(default=0)
+    skipped=models.PositiveIntegerField(default=0)
+    failed=models.PositiveIntegerField(default=0)
+    created_at=models.DateTimeField(auto_now_add=True)
+    finished_at=models.DateTimeField(null=True,blank=True)
+
+    class Meta:
+        ordering=['-created_at']
+
+
+# Result of running a challenge's reference solution (solution_code) for
+# one language against its test cases (see challenge.validation).
+class ChallengeValidation(models.Model):
+
+    STATUS_CHOICES = [
+        ('passed', 'Passed'),
+        ('failed', 'Failed'),
+        ('error', 'Error'),
+    ]
+
+    challenge=models.ForeignKey(Challenge,on_delete=models.CASCADE,related_name='validations')
+    language=models.CharField(max_length=30)
+    test_cases_version=models.PositiveIntegerField()
+    status=models.CharField(max_length=10,choices=STATUS_CHOICES)
+    passed=models.PositiveIntegerField(default=0)
+    total=models.PositiveIntegerField(default=0)
+    mismatches=models.JSONField(default=list)
+    case_wall_times=models.JSONField(default=list,help_text="Wall time of each test case in seconds")
+    max_wall_time=models.FloatField(null=True,blank=True,help_text="Slowest test case in seconds")
+    validated_at=models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering=['language']
+        constraints=[
+            models.UniqueConstraint(fields=['challenge','language'],name='unique_challenge_validation')
+        ]
+
+
 class Solutions(models.Model):
     challenge = models.ForeignKey(Challenge, on_delete=models.CASCADE, related_name='solutions')
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -0,0 +1,221 @@
+import time
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F,Max,Case,When,Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from accounts.models import User
+from challenge.admission import AdmissionDenied,execution_slot
+from challenge.judge import (
+    run_test_cases,get_challenge_harness,get_fail_fast_after,get_measured_runtime,build_test_results,report_cases,
+    record_judging
+)
+from challenge.models import Submission,SubmissionTestResult,RejudgeJob
+from challenge.result_cache import get_cached_results,cache_results
+from challenge.runtime_stats import rebuild_runtime_histograms
+from challenge.stats import rebuild_challenge_stats
+
+
+# Re-judging a challenge: the latest judged submission of every
+# (user, language) pair is run against the current test cases in chunks
+# (see rejudge_challenge_task / rejudge_chunk_task). All of a user's
+# submissions land in the same chunk so their XP can be settled in one go.
+# Chunks run on the low-priority rejudge lane, are rate limited per worker
+# (CELERY_TASK_ANNOTATIONS) and only take the rejudge share of each
+# language's execution slots, so live judging keeps its capacity.
+
+
+def create_rejudge_job(challenge,requested_by=None):
+    return RejudgeJob.objects.create(
+        challenge=challenge,
+        requested_by=requested_by,
+        test_cases_version=challenge.test_cases_version
+    )
+
+
+# Submission ids to re-judge, split into chunks of about
+# JUDGE_REJUDGE_CHUNK_SIZE without splitting a user across chunks.
+def plan_rejudge_chunks(job):
+    rows=(
+        Submission.objects.filter(challenge_id=job.challenge_id,status='judged')
+        .values('user_id','language')
+        .annotate(latest_id=Max('id'))
+        .order_by('user_id')
+    )
+    chunks=[]
+    chunk=[]
+    last_user_id=None
+    for row in rows:
+        if row['user_id'] != last_user_id and len(chunk) >= settings.JUDGE_REJUDGE_CHUNK_SIZE:
+            chunks.append(chunk)
+            chunk=[]
+        chunk.append(row['latest_id'])
+        last_user_id=row['user_id']
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def start_rejudge_job(job,chunks):
+    total=sum(len(chunk) for chunk in chunks)
+    RejudgeJob.objects.filter(id=job.id).update(total=total)
+    job.total=total
+    if not total:
+        finish_rejudge_job(job.id)
+
+
+# Marks the job done (or failed, when a chunk failed) once every chunk
+# has reported (exactly one chunk wins the update) and rebuilds the
+# challenge's runtime histograms and stats.
+def finish_rejudge_job(job_id):
+    finished=RejudgeJob.objects.filter(id=job_id,status='running',processed__gte=F('total')).update(
+        status=Case(When(failed__gt=0,then=Value('failed')),default=Value('done')),
+        finished_at=timezone.now()
+    )
+    if finished:
+        job=RejudgeJob.objects.get(id=job_id)
+        rebuild_runtime_histograms(job.challenge_id)
+        rebuild_challenge_stats(job.challenge_id)
+
+
+# Runs one submission against the current test cases, waiting for a
+# rejudge execution slot. Identical code (from any user) is only run once
+# per test case version thanks to the result cache.
+def rejudge_outcomes(submission):
+    challenge=submission.challenge
+    cached=get_cached_results('submit',challenge,submission.code,submission.language)
+    if cached:
+        return cached['outcomes'],cached['runtime']
+
+    while True:
+        try:
+            start_time=time.time()
+            if settings.JUDGE_ADMISSION_ENABLED:
+                with execution_slot(submission.language,'rejudge'):
+                    outcomes=run_submission(submission)
+            else:
+                outcomes=run_submission(submission)
+            break
+        except AdmissionDenied as denied:
+            time.sleep(denied.retry_after)
+    record_judging('rejudge',challenge,submission.language,outcomes,time.time()-start_time)
+
+    runtime=get_measured_runtime(outcomes)
+    if runtime is not None:
+        cache_results('submit',challenge,submission.code,submission.language,outcomes,runtime=runtime)
+    return outcomes,runtime
+
+
+def run_submission(submission):
+    challenge=submission.challenge
+    return run_test_cases(
+        submission.code,submission.language,challenge.function_signature.strip(),challenge.test_cases,
+        max_failures=get_fail_fast_after(challenge),
+        harness=get_challenge_harness(challenge,submission.language)
+    )
+
+
+# Re-judges one chunk of submissions and writes the new verdicts, test
+# results and XP changes in bulk. Submissions the executor could not run
+# (system errors, e.g. a rate limited Piston) keep their verdict: they are
+# returned to be retried or, on the `final` attempt, counted as skipped.
+# Returns the ids of those submissions.
+def rejudge_chunk(job_id,submission_ids,final=True):
+    job=RejudgeJob.objects.select_related('challenge').get(id=job_id)
+    challenge=job.challenge
+    if job.status != 'running':
+        return []
+    if challenge.test_cases_version != job.test_cases_version:
+        RejudgeJob.objects.filter(id=job_id,status='running').update(status='cancelled',finished_at=timezone.now())
+        return []
+
+    cases=challenge.test_cases
+    submissions=[]
+    unjudged=[]
+    test_results=[]
+    changed=0
+    for submission in Submission.objects.filter(id__in=submission_ids).select_related('challenge'):
+        outcomes,runtime=rejudge_outcomes(submission)
+        if any(outcome.get('system_error') for outcome in outcomes):
+            unjudged.append(submission.id)
+            continue
+        submissions.append(submission)
+        console_output,passed,failed_hidden_cases=report_cases(cases,outcomes)
+        is_completed=passed==len(cases)
+        if is_completed != submission.is_completed or passed != submission.passed_test_cases:
+            changed+=1
+
+        console_output.append({
+            'type':'info',
+            'message':f"{passed}/{len(cases)} test cases passed (re-judged after the test cases changed)"
+        })
+        for error in failed_hidden_cases:
+            console_output.append({
+                'type': 'error',
+                'message': 'Hidden Test Case Failed',
+                'details': error
+            })
+        submission.is_completed=is_completed
+        submission.passed_test_cases=passed
+        submission.total_test_cases=len(cases)
+        if runtime is not None:
+            submission.runtime=runtime
+        submission.result={
+            'console_output':console_output,
+            'result_summary':{
+                'passed':passed,
+                'total':len(cases),
+                'is_completed':is_completed,
+                'rejudged':True
+            }
+        }
+        test_results.extend(build_test_results(submission,outcomes))
+
+    with transaction.atomic():
+        Submission.objects.bulk_update(
+            submissions,
+            ['is_completed','passed_test_cases','total_test_cases','runtime','result']
+        )
+        SubmissionTestResult.objects.filter(submission__in=submissions).delete()
+        SubmissionTestResult.objects.bulk_create(test_results)
+        adjust_xp(challenge,{submission.user_id for submission in submissions})
+        skipped=len(unjudged) if final else 0
+        RejudgeJob.objects.filter(id=job_id).update(
+            processed=F('processed')+len(submissions)+skipped,
+            changed=F('changed')+changed,
+            skipped=F('skipped')+skipped
+        )
+    finish_rejudge_job(job_id)
+    return unjudged
+
+
+# Counts a chunk that could not be re-judged at all as processed and
+# failed, so the job still finishes (as failed) instead of running forever.
+def fail_rejudge_chunk(job_id,submission_ids):
+    RejudgeJob.objects.filter(id=job_id).update(
+        processed=F('processed')+len(submission_ids),
+        failed=F('failed')+len(submission_ids)
+    )
+    finish_rejudge_job(job_id)
+
+
+def fail_rejudge_job(job_id):
+    RejudgeJob.objects.filter(id=job_id,status='running').update(status='failed',finished_at=timezone.now())
+
+
+# Brings each user's XP for the challenge in line with the new verdicts:
+# the reward is granted (on the earliest accepted submission) to users who
+# now have an accepted submission and no reward, and taken back from users
+# who were rewarded but no longer have one.
+def adjust_xp(challenge,user_ids):
+    for user_id in user_ids:
+        submissions=Submission.objects.filter(user_id=user_id,challenge=challenge)
+        rewarded=submissions.filter(xp_awarded__gt=0)
+        accepted=submissions.filter(is_completed=True).order_by('created_at').first()
+        if accepted and not rewarded.exists():
+            Submission.objects.filter(id=accepted.id).update(xp_awarded=challenge.xp_reward)
+            User.objects.filter(id=user_id).update(xp=F('xp')+challenge.xp_reward)
+        elif not accepted and rewarded.exists():
+            revoked=sum(rewarded.values_list('xp_awarded',flat=True))
+            rewarded.update(xp_awarded=0)
+            User.objects.filter(id=user_id).update(xp=Greatest(F('xp')-revoked,0))
@@ -0,0 +1,49 @@
+import hashlib
+import json
+import logging
+from django.conf import settings
+from django.core.cache import caches
+from challenge.harness import HARNESS_VERSION
+
+logger=logging.getLogger(__name__)
+
+
+# Content-addressed cache of per-test-case run results, stored in the
+# "judge" cache (Redis). The key covers everything that can change the
+# outcome: the code, the language, the challenge's test case version and
+# the harness, so editing a challenge's test cases or function signature
+# (which bumps Challenge.test_cases_version) makes old entries unreachable;
+# they then expire through the cache TTL.
+def result_cache_key(scope,challenge,code,language):
+    digest=hashlib.sha256('\0'.join([
+        HARNESS_VERSION,
+        settings.JUDGE_ARGUMENT_PROTOCOL,
+        language,
+        code
+    ]).encode()).hexdigest()
+    return f"judge:{scope}:{challenge.id}:{challenge.test_cases_version}:{digest}"
+
+
+# Returns the cached entry, {'outcomes': [...], 'runtime': ...} with
+# {'stdout', 'stderr', 'input_args', 'passed'} per case, or None.
+# Cache outages are treated as misses.
+def get_cached_results(scope,challenge,code,language):
+    try:
+        return caches['judge'].get(result_cache_key(scope,challenge,code,language))
+    except Exception:
+        logger.exception("judge result cache unavailable")
+        return None
+
+
+# Stores the outcomes unless one of them is an executor failure (which
+# says nothing about the code) or the entry is over the size cap.
+def cache_results(scope,challenge,code,language,outcomes,runtime=None):
+    if any(outcome.get('system_error') for outcome in outcomes):
+        return
+    entry={'outcomes':outcomes,'runtime':runtime}
+    if len(json.dumps(entry)) > settings.JUDGE_RESULT_CACHE_MAX_ENTRY_BYTES:
+        return
+    try:
+        caches['judge'].set(result_cache_key(scope,challenge,code,language),entry)
+    except Exception:
+        logger.exception("judge result cache unavailable")
@@ -0,0 +1,6 @@
+from django.urls import re_path
+from challenge.consumers import SubmissionConsumer
+
+websocket_urlpatterns =[
+    re_path(r"ws/submissions/$",SubmissionConsumer.as_asgi())
+]
@@ -0,0 +1,105 @@
+import math
+from django.db import transaction
+from django.db.models import Min
+from django.db.models.functions import MD5
+from challenge.models import Submission,RuntimeHistogram
+
+
+# Runtimes are counted in logarithmic buckets: bucket 0 holds everything
+# up to RUNTIME_BUCKET_BASE seconds and each later bucket is
+# RUNTIME_BUCKET_GROWTH times wider than the previous one, so percentiles
+# are accurate to a few percent of the runtime from 1ms to over a minute.
+RUNTIME_BUCKET_BASE=0.001
+RUNTIME_BUCKET_GROWTH=1.25
+RUNTIME_BUCKETS=52
+
+
+def get_bucket(runtime):
+    if runtime <= RUNTIME_BUCKET_BASE:
+        return 0
+    bucket=math.ceil(math.log(runtime/RUNTIME_BUCKET_BASE,RUNTIME_BUCKET_GROWTH))
+    return min(bucket,RUNTIME_BUCKETS-1)
+
+
+def empty_counts():
+    return [0]*RUNTIME_BUCKETS
+
+
+# Adds one accepted runtime to the challenge's histogram for `language`.
+# The row is locked so concurrent judges do not lose increments.
+def record_runtime(challenge,language,runtime):
+    with transaction.atomic():
+        RuntimeHistogram.objects.get_or_create(
+            challenge=challenge,language=language,
+            defaults={'counts':empty_counts()}
+        )
+        histogram=RuntimeHistogram.objects.select_for_update().get(challenge=challenge,language=language)
+        histogram.counts[get_bucket(runtime)]+=1
+        histogram.total+=1
+        histogram.save(update_fields=['counts','total'])
+
+
+# Whether the user had this exact code accepted for the challenge and
+# language in an earlier submission. Repeats add no runtime sample, so resubmitting the same
+# solution (often straight from the result cache) cannot skew percentiles.
+def is_repeat_solution(submission):
+    return Submission.objects.filter(
+        user_id=submission.user_id,
+        challenge_id=submission.challenge_id,
+        language=submission.language,
+        code=submission.code,
+        is_completed=True,
+        id__lt=submission.id
+    ).exists()
+
+
+# Percentage of the other accepted submissions in the histogram that were
+# slower than `runtime` (half of the others in its own bucket count as
+# slower), or None when there is nothing to compare against. `recorded`
+# says whether the submission's own sample is in the histogram; repeat
+# solutions are not, so nothing is taken out for them.
+def get_faster_than(histogram,runtime,recorded=True):
+    own=1 if recorded else 0
+    others=histogram.total-own
+    if others <= 0:
+        return None
+    bucket=get_bucket(runtime)
+    slower=sum(histogram.counts[bucket+1:])+max(histogram.counts[bucket]-own,0)/2
+    return round(100*min(slower/others,1),1)
+
+
+# Recomputes the histograms (of one challenge, or all) from the accepted
+# submissions, counting the first of each user's identical solutions only
+# (see is_repeat_solution). Returns (histograms, submissions) counted.
+def rebuild_runtime_histograms(challenge_id=None):
+    submissions=Submission.objects.filter(is_completed=True,runtime__isnull=False)
+    histograms=RuntimeHistogram.objects.all()
+    if challenge_id:
+        submissions=submissions.filter(challenge_id=challenge_id)
+        histograms=histograms.filter(challenge_id=challenge_id)
+
+    counts={}
+    first_ids=(
+        submissions.annotate(code_hash=MD5('code'))
+        .values('challenge_id','language','user_id','code_hash')
+        .annotate(first_id=Min('id'))
+        .values('first_id')
+    )
+    rows=(
+        Submission.objects.filter(id__in=first_ids)
+        .values_list('challenge_id','language','runtime')
+        .iterator(chunk_size=5000)
+    )
+    for challenge_id,language,runtime in rows:
+        key=(challenge_id,language)
+        if key not in counts:
+            counts[key]=empty_counts()
+        counts[key][get_bucket(runtime)]+=1
+
+    with transaction.atomic():
+        histograms.delete()
+        RuntimeHistogram.objects.bulk_create([
+            RuntimeHistogram(challenge_id=challenge_id,language=language,counts=buckets,total=sum(buckets))
+            for (challenge_id,language),buckets in counts.items()
+        ])
+    return len(counts),sum(sum(buckets) for buckets in counts.values())
@@ -0,0 +1,18 @@
+from django.contrib.postgres.search import SearchQuery,SearchRank,TrigramWordSimilarity
+from django.db.models import F,Q,FloatField
+from django.db.models.functions import Cast
+
+
+# Ranked challenge search. Matches the weighted full-text document
+# Challenge.search_vector (title, then tags, then description; English
+# stemming and web search syntax such as "graph -tree") and, for typos and
+# partial words, titles containing words trigram-similar to the text or
+# the text itself. Every branch is served by a GIN index (the substring
+# match by the trigram index on UPPER(title)). Adds `rank`, the
+# full-text rank plus the title word similarity, as a double so it can be
+# used in cursors.
+def search_challenges(challenges,text):
+    query=SearchQuery(text,config='english',search_type='websearch')
+    return challenges.annotate(
+        rank=Cast(SearchRank(F('search_vector'),query)+TrigramWordSimilarity(text,'title'),FloatField())
+    ).filter(Q(search_vector=query)|Q(title__trigram_word_similar=text)|Q(title__icontains=text))
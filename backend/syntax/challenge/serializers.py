@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from challenge.models import Challenge,Submission,Solutions,ChallengeRequest
+from challenge.models import Challenge,Submission,SubmissionTestResult,RejudgeJob,ChallengeValidation,Solutions,ChallengeRequest
 
 class ChallengeSerializer(serializers.ModelSerializer):
 
@@ -8,14 +8,47 @@ class ChallengeSerializer(serializers.ModelSerializer):
     
     class Meta:
         model=Challenge
-        fields='__all__'
+        exclude=['search_vector']
+        read_only_fields=['test_cases_version']
+
+
 
+# Model fields of a challenge list card: no test cases, code or hints.
+CHALLENGE_CARD_FIELDS=[
+    "id",
+    "title",
+    "description",
+    "difficulty",
+    "tags",
+    "time_limit",
+    "xp_reward",
+    "is_premium",
+    "is_active",
+    "start_time",
+    "end_time",
+    "created_at"
+]
+
+
+# A challenge list card. The user and stats fields come from annotations
+# (see ChallengeListView).
+class ChallengeCardSerializer(serializers.ModelSerializer):
+    start_time = serializers.DateTimeField(format="%Y-%m-%dT%H:%M", read_only=True)
+    end_time = serializers.DateTimeField(format="%Y-%m-%dT%H:%M", read_only=True)
+    is_completed=serializers.BooleanField(read_only=True)
+    success_rate=serializers.FloatField(read_only=True)
+    completed_users=serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model=Challenge
+        fields=CHALLENGE_CARD_FIELDS+["is_completed","success_rate","completed_users"]
 
 
 class ChallengeCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model=Challenge
-        fields='__all__'
+        exclude=['search_vector']
+        read_only_fields=['test_cases_version']
 
 class SubmissionSerializer(serializers.Serializer):
     challenge_id = serializers.IntegerField()
@@ -35,11 +68,30 @@ class SubmissionListSerializer(serializers.ModelSerializer):
             "total_test_cases",
             "runtime",
             "xp_awarded",
+            "status",
             "created_at"
         ]
 
 
 
+class SubmissionTestResultSerializer(serializers.ModelSerializer):
+    class Meta:
+        model=SubmissionTestResult
+        fields=["index","status","cpu_time","wall_time","memory"]
+
+
+class RejudgeJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model=RejudgeJob
+        fields=["id","challenge","test_cases_version","status","total","processed","changed","skipped","failed","created_at","finished_at"]
+
+
+class ChallengeValidationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model=ChallengeValidation
+        fields=["language","test_cases_version","status","passed","total","mismatches","case_wall_times","max_wall_time","validated_at"]
+
+
 class SolutionSerializer(serializers.ModelSerializer):
     username=serializers.CharField(source='user.username',read_only=True)
     class Meta:
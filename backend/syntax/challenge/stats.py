@@ -0,0 +1,94 @@
+from django.db import transaction
+from django.db.models import F
+from accounts.models import User
+from challenge.models import Submission,ChallengeStats,UserChallengeProgress
+
+
+def get_success_rate(solvers,attempts):
+    return round((solvers/attempts)*100,2) if attempts else 0.0
+
+
+# Counts one judged submission in its challenge's stats and its user's
+# progress on the challenge (neither is saved here).
+def count_submission(stats,progress,submission):
+    stats.attempts+=1
+    if not progress.attempts:
+        stats.attempters+=1
+    if submission.is_completed and progress.first_solved_at is None:
+        stats.solvers+=1
+    stats.success_rate=get_success_rate(stats.solvers,stats.attempts)
+
+    progress.attempts+=1
+    progress.last_failed=not submission.is_completed
+    if not submission.is_completed:
+        progress.failed_attempts+=1
+        return
+    if progress.first_solved_at is None:
+        progress.first_solved_at=submission.created_at
+    if submission.runtime is not None and (progress.best_runtime is None or submission.runtime < progress.best_runtime):
+        progress.best_runtime=submission.runtime
+    if submission.language not in progress.languages_solved:
+        progress.languages_solved=progress.languages_solved+[submission.language]
+
+
+def lock_row(model,**lookup):
+    model.objects.get_or_create(**lookup)
+    return model.objects.select_for_update().get(**lookup)
+
+
+# Saves a judged submission and counts it in its challenge's stats and its
+# user's progress in one transaction. Both rows are locked before the
+# submission is saved, so concurrent submissions of one user are counted
+# in turn; the challenge's XP is awarded (submission.xp_awarded) under the
+# same lock, only to the user's first accepted submission.
+# Returns (progress, already_completed), the latter being whether the user
+# had solved the challenge before this submission.
+def save_judged_submission(submission):
+    with transaction.atomic():
+        stats=lock_row(ChallengeStats,challenge_id=submission.challenge_id)
+        progress=lock_row(UserChallengeProgress,user_id=submission.user_id,challenge_id=submission.challenge_id)
+        already_completed=progress.first_solved_at is not None
+        submission.xp_awarded=submission.challenge.xp_reward if submission.is_completed and not already_completed else 0
+        submission.save()
+        if submission.xp_awarded:
+            User.objects.filter(id=submission.user_id).update(xp=F('xp')+submission.xp_awarded)
+        count_submission(stats,progress,submission)
+        stats.save()
+        progress.save()
+    return progress,already_completed
+
+
+# Replays judged submissions (in id order) into unsaved stats and progress rows.
+def build_stats(submissions):
+    stats={}
+    progress={}
+    for submission in submissions:
+        challenge_id=submission.challenge_id
+        key=(submission.user_id,challenge_id)
+        if challenge_id not in stats:
+            stats[challenge_id]=ChallengeStats(challenge_id=challenge_id)
+        if key not in progress:
+            progress[key]=UserChallengeProgress(user_id=submission.user_id,challenge_id=challenge_id)
+        count_submission(stats[challenge_id],progress[key],submission)
+    return list(stats.values()),list(progress.values())
+
+
+# Recomputes the stats and user progress (of one challenge, or all) from
+# the judged submissions. Returns the number of (stats, progress) rows.
+def rebuild_challenge_stats(challenge_id=None):
+    submissions=Submission.objects.filter(status='judged')
+    stats=ChallengeStats.objects.all()
+    progress=UserChallengeProgress.objects.all()
+    if challenge_id:
+        submissions=submissions.filter(challenge_id=challenge_id)
+        stats=stats.filter(challenge_id=challenge_id)
+        progress=progress.filter(challenge_id=challenge_id)
+
+    submissions=submissions.only('user','challenge','language','is_completed','runtime','created_at').order_by('id')
+    new_stats,new_progress=build_stats(submissions.iterator(chunk_size=5000))
+    with transaction.atomic():
+        stats.delete()
+        progress.delete()
+        ChallengeStats.objects.bulk_create(new_stats,batch_size=1000)
+        UserChallengeProgress.objects.bulk_create(new_progress,batch_size=1000)
+    return len(new_stats),len(new_progress)
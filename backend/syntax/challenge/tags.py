@@ -0,0 +1,125 @@
+from collections import Counter
+from django.db import transaction
+from django.db.models import Count,F,Value,IntegerField,CharField
+from challenge.models import Challenge,Tag,ChallengeTag,ChallengeFacetCount
+
+
+# Tag names of a challenge's `tags` list, stripped and without duplicates.
+def clean_tags(tags):
+    names=[]
+    for tag in tags or []:
+        name=str(tag).strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+# Points the challenge's ChallengeTag links at its current `tags`.
+# Returns the ids of every tag it gained, kept or lost.
+def link_challenge_tags(challenge):
+    names=clean_tags(challenge.tags)
+    Tag.objects.bulk_create([Tag(name=name) for name in names],ignore_conflicts=True)
+    tag_ids=set(Tag.objects.filter(name__in=names).values_list('id',flat=True))
+    linked=set(ChallengeTag.objects.filter(challenge=challenge).values_list('tag_id',flat=True))
+    ChallengeTag.objects.filter(challenge=challenge).exclude(tag_id__in=tag_ids).delete()
+    ChallengeTag.objects.bulk_create(
+        [ChallengeTag(challenge=challenge,tag_id=tag_id) for tag_id in tag_ids-linked],
+        ignore_conflicts=True
+    )
+    return tag_ids|linked
+
+
+# Syncs the tag links of a challenge that was created, updated or
+# blocked and refreshes the facet counts it may have changed.
+def sync_challenge_tags(challenge):
+    with transaction.atomic():
+        refresh_facet_counts(link_challenge_tags(challenge))
+
+
+# One aggregate query (a UNION ALL) counting `challenges` per tag and
+# difficulty, plus one row per difficulty with no tag for the totals.
+# Rows are {'facet_tag', 'facet_name', 'facet_difficulty', 'count'}.
+def facet_rows(challenges,tag_ids=None):
+    links=ChallengeTag.objects.filter(challenge__in=challenges)
+    if tag_ids is not None:
+        links=links.filter(tag_id__in=tag_ids)
+    by_tag=links.annotate(
+        facet_tag=F('tag_id'),
+        facet_name=F('tag__name'),
+        facet_difficulty=F('challenge__difficulty')
+    ).values('facet_tag','facet_name','facet_difficulty').annotate(count=Count('id')).order_by()
+    totals=challenges.annotate(
+        facet_tag=Value(None,output_field=IntegerField()),
+        facet_name=Value(None,output_field=CharField()),
+        facet_difficulty=F('difficulty')
+    ).values('facet_tag','facet_name','facet_difficulty').annotate(count=Count('id')).order_by()
+    return list(by_tag.union(totals,all=True))
+
+
+# Recounts the cached facets of the given tags and the difficulty totals.
+# Every refresh updates the total rows in place, so locking them first
+# serializes concurrent refreshes.
+def refresh_facet_counts(tag_ids):
+    with transaction.atomic():
+        totals={
+            row.difficulty:row
+            for row in ChallengeFacetCount.objects.select_for_update().filter(tag__isnull=True)
+        }
+        rows=facet_rows(Challenge.objects.filter(is_active=True),tag_ids)
+
+        counts={difficulty:0 for difficulty,_ in Challenge.DIFFICULTY_CHOICES}
+        counts.update((difficulty,0) for difficulty in totals)
+        for row in rows:
+            if row['facet_tag'] is None:
+                counts[row['facet_difficulty']]=row['count']
+        for difficulty,count in counts.items():
+            total=totals.get(difficulty) or ChallengeFacetCount(difficulty=difficulty)
+            total.count=count
+            total.save()
+
+        ChallengeFacetCount.objects.filter(tag_id__in=tag_ids).delete()
+        ChallengeFacetCount.objects.bulk_create([
+            ChallengeFacetCount(tag_id=row['facet_tag'],difficulty=row['facet_difficulty'],count=row['count'])
+            for row in rows if row['facet_tag'] is not None
+        ])
+
+
+# The cached facet rows of every active challenge, in facet_rows' shape.
+def cached_facet_rows():
+    return list(ChallengeFacetCount.objects.filter(count__gt=0).values(
+        'count',
+        facet_tag=F('tag_id'),
+        facet_name=F('tag__name'),
+        facet_difficulty=F('difficulty')
+    ))
+
+
+# Folds facet rows into {'tags': {name: count}, 'difficulties': {difficulty: count}}.
+# Tag counts honour the difficulty filter and difficulty counts the tag
+# filter, so each facet shows what picking one of its values would list.
+def fold_facets(rows,difficulty=None,tag=None):
+    tags=Counter()
+    difficulties=Counter({difficulty:0 for difficulty,_ in Challenge.DIFFICULTY_CHOICES})
+    for row in rows:
+        if row['facet_tag'] is None:
+            if not tag:
+                difficulties[row['facet_difficulty']]+=row['count']
+            continue
+        if not difficulty or row['facet_difficulty'] == difficulty:
+            tags[row['facet_name']]+=row['count']
+        if tag and row['facet_name'] == tag:
+            difficulties[row['facet_difficulty']]+=row['count']
+    return {'tags':dict(tags),'difficulties':dict(difficulties)}
+
+
+# Relinks the tags of every challenge and recounts every facet.
+# Returns (challenges, tags).
+def rebuild_challenge_tags():
+    with transaction.atomic():
+        challenges=0
+        for challenge in Challenge.objects.only('id','tags').iterator():
+            link_challenge_tags(challenge)
+            challenges+=1
+        tag_ids=set(Tag.objects.values_list('id',flat=True))
+        refresh_facet_counts(tag_ids)
+    return challenges,len(tag_ids)
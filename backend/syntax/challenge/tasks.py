@@ -0,0 +1,114 @@
+import requests
+from celery import shared_task,Task
+from django.utils import timezone
+from challenge import metrics
+from challenge.models import Submission
+from challenge.judge import judge_submission
+from challenge.lanes import LANE_QUEUES
+from challenge.models import Challenge,RejudgeJob
+from challenge.rejudge import plan_rejudge_chunks,start_rejudge_job,rejudge_chunk,fail_rejudge_chunk,fail_rejudge_job
+from challenge.validation import validate_challenge
+from challenge.utils import send_submission_event
+
+
+# Judges a queued submission on its lane's judge queue
+# (see challenge.lanes) and streams per-test-case progress
+# to the submitting user's websocket group.
+@shared_task
+def judge_submission_task(submission_id,lane='standard'):
+    submission=Submission.objects.select_related('challenge','user').get(id=submission_id)
+    user_id=submission.user_id
+    metrics.observe(
+        'judge_queue_wait_seconds',
+        (timezone.now()-submission.created_at).total_seconds(),
+        lane=lane,
+        language=submission.language
+    )
+
+    submission.status='running'
+    submission.save(update_fields=['status'])
+    send_submission_event(user_id,{
+        'type':'status',
+        'submission_id':submission_id,
+        'status':submission.status
+    })
+
+    def on_progress(index,total,passed,hidden):
+        send_submission_event(user_id,{
+            'type':'progress',
+            'submission_id':submission_id,
+            'test_case':index+1,
+            'total':total,
+            'passed':passed,
+            'hidden':hidden
+        })
+
+    try:
+        result=judge_submission(submission,on_progress=on_progress)
+    except Exception:
+        submission.status='failed'
+        submission.save(update_fields=['status'])
+        send_submission_event(user_id,{
+            'type':'status',
+            'submission_id':submission_id,
+            'status':submission.status
+        })
+        raise
+
+    send_submission_event(user_id,{
+        'type':'result',
+        'submission_id':submission_id,
+        'status':submission.status,
+        'result':result
+    })
+
+
+# Marks the re-judge job failed when planning it fails for good.
+class RejudgeJobTask(Task):
+    def on_failure(self,exc,task_id,args,kwargs,einfo):
+        fail_rejudge_job(args[0])
+
+
+# Records the chunk as failed once its retries are used up, so the job
+# always finishes.
+class RejudgeChunkTask(Task):
+    def on_failure(self,exc,task_id,args,kwargs,einfo):
+        fail_rejudge_chunk(*args)
+
+
+# Fans a re-judge job out as one rejudge_chunk_task per chunk on the
+# rejudge lane (see challenge.rejudge).
+@shared_task(base=RejudgeJobTask)
+def rejudge_challenge_task(job_id):
+    job=RejudgeJob.objects.get(id=job_id)
+    chunks=plan_rejudge_chunks(job)
+    start_rejudge_job(job,chunks)
+    for chunk in chunks:
+        rejudge_chunk_task.apply_async((job_id,chunk),queue=LANE_QUEUES['rejudge'])
+
+
+# Executor outages are retried with backoff: a chunk that raises is run
+# again whole, and submissions that hit a system error are retried on
+# their own until the last attempt skips them.
+@shared_task(
+    bind=True,
+    base=RejudgeChunkTask,
+    autoretry_for=(requests.RequestException,),
+    max_retries=3,
+    retry_backoff=30,
+    retry_jitter=True
+)
+def rejudge_chunk_task(self,job_id,submission_ids):
+    final=self.request.retries >= self.max_retries
+    unjudged=rejudge_chunk(job_id,submission_ids,final=final)
+    if unjudged and not final:
+        raise self.retry(args=(job_id,unjudged),countdown=30*2**self.request.retries)
+
+
+# Checks a challenge's reference solutions against its test cases after
+# it is created or updated (see challenge.validation).
+@shared_task
+def validate_challenge_task(challenge_id):
+    challenge=Challenge.objects.filter(id=challenge_id).first()
+    if challenge:
+        validate_challenge(challenge)
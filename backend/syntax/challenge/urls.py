@@ -1,15 +1,20 @@
 from django.urls import path
-from challenge.views import ChallengeCreateView,ChallengeListView,ChallengeBlockView,ChallengeDetailView,RunChallengeView,SubmitChallengeView,SubmissionListView,ChallengeUpdateView,SolutionListView,CreateSolutionView,SolutionEditView,SolutionDeleteView,CompletedLanguagesStatsView,UserDomainStatsView,CreateChallengeRequestView,ChallengeRequestListView,ChallengeRequestStatusUpdateView,TimeLimitedChallengesView
+from challenge.views import ChallengeCreateView,ChallengeListView,ChallengeBlockView,ChallengeDetailView,RunChallengeView,SubmitChallengeView,SubmissionStatusView,SubmissionPercentileView,SubmissionListView,ChallengeUpdateView,ChallengeRejudgeView,ChallengeValidationView,SolutionListView,CreateSolutionView,SolutionEditView,SolutionDeleteView,CompletedLanguagesStatsView,UserDomainStatsView,CreateChallengeRequestView,ChallengeRequestListView,ChallengeRequestStatusUpdateView,TimeLimitedChallengesView,JudgeMetricsView,ChallengeFacetView
 
 urlpatterns = [
     path('create/',ChallengeCreateView.as_view(),name='create_challenge'),
     path('list/',ChallengeListView.as_view(),name='challenge_list'),
+    path('facets/',ChallengeFacetView.as_view(),name='challenge_facets'),
     path('<int:id>/block/',ChallengeBlockView.as_view(),name='block-challenge'),
     path('<int:id>/',ChallengeDetailView.as_view(),name='challenge-detail'),
     path('run/',RunChallengeView.as_view(),name='run-challenge'),
     path('submit/',SubmitChallengeView.as_view(),name='submit-challenge'),
+    path('submission/<int:submission_id>/',SubmissionStatusView.as_view(),name='submission-status'),
+    path('submission/<int:submission_id>/percentile/',SubmissionPercentileView.as_view(),name='submission-percentile'),
     path('<int:id>/submissions/',SubmissionListView.as_view(),name='submissions'),
     path('<int:id>/update/',ChallengeUpdateView.as_view(),name='update_challenge'),
+    path('<int:id>/rejudge/',ChallengeRejudgeView.as_view(),name='rejudge_challenge'),
+    path('<int:id>/validation/',ChallengeValidationView.as_view(),name='challenge_validation'),
     path('<int:challenge_id>/add-solution/',CreateSolutionView.as_view(),name='create-solution'),
     path('<int:challenge_id>/solutions/',SolutionListView.as_view(),name='solution-list'),
     path('<int:challenge_id>/edit-solution/<int:solution_id>/',SolutionEditView.as_view(),name='edit-solution'),
@@ -20,5 +25,6 @@ urlpatterns = [
     path('challenge-requests/',ChallengeRequestListView.as_view(),name='challenge-requests'),
     path('request-status-update/<int:request_id>/',ChallengeRequestStatusUpdateView.as_view(),name='request-status-update'),
     path('timed-challenge/',TimeLimitedChallengesView.as_view(),name='timed-challenge'),
+    path('metrics/',JudgeMetricsView.as_view(),name='judge-metrics'),
 
 ]
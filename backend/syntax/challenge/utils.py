@@ -1,5 +1,8 @@
 import json
-from datetime import date,timedelta
+from base64 import urlsafe_b64decode,urlsafe_b64encode
+from datetime import date,datetime,timedelta
+from channels.layers import get_channel_layer
+from asgiref.sync import async_to_sync
 
 
 def format_input_args(input_str,language):
@@ -47,4 +50,33 @@ def update_user_streak(user):
         user.longest_streak=user.current_streak
     
     user.last_solved_date=today
-    user.save()
\ No newline at end of file
+    user.save()
+
+
+# Opaque keyset pagination cursor for lists ordered by (created_at, id),
+# newest first, or by search rank before that: the position of the last
+# row of the previous page.
+def encode_cursor(created_at,id,rank=None):
+    return urlsafe_b64encode(json.dumps([created_at.isoformat(),id,rank]).encode()).decode()
+
+
+# Returns (created_at, id, rank), or None when the cursor is malformed.
+def decode_cursor(cursor):
+    try:
+        created_at,id,rank=json.loads(urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at),int(id),float(rank) if rank is not None else None
+    except (ValueError,TypeError):
+        return None
+
+
+# Pushes a judge event to every websocket the user has open
+# on ws/submissions/ (see SubmissionConsumer).
+def send_submission_event(user_id,data):
+    channel_layer=get_channel_layer()
+    async_to_sync(channel_layer.group_send)(
+        f"submissions_{user_id}",
+        {
+            "type": "submission_event",
+            "data": data
+        }
+    )
@@ -0,0 +1,77 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from challenge.harness import FILE_EXTENSIONS
+from challenge.judge import run_test_cases,get_challenge_harness
+from challenge.models import ChallengeValidation
+
+
+# Runs every language's reference solution (Challenge.solution_code)
+# against all of the challenge's test cases through the configured
+# executor, one thread per language, and stores one ChallengeValidation
+# per language: mismatching cases and the wall time of every case.
+def validate_challenge(challenge):
+    solutions={
+        language:code for language,code in (challenge.solution_code or {}).items()
+        if language in FILE_EXTENSIONS and code and code.strip()
+    }
+    if not solutions:
+        return []
+    # a dedicated pool: the judge pool may be needed by the cases themselves
+    with ThreadPoolExecutor(max_workers=len(solutions),thread_name_prefix='validate') as pool:
+        futures=[pool.submit(validate_language,challenge,language,code) for language,code in solutions.items()]
+        validations=[future.result() for future in futures]
+    ChallengeValidation.objects.filter(challenge=challenge).exclude(language__in=solutions).delete()
+    return validations
+
+
+def validate_language(challenge,language,code):
+    cases=challenge.test_cases
+    outcomes=run_test_cases(
+        code,language,challenge.function_signature.strip(),cases,
+        harness=get_challenge_harness(challenge,language)
+    )
+    mismatches=[
+        {
+            'index':i,
+            'input':case['input'],
+            'expected':case['output'].strip(),
+            'actual':outcome['stdout'],
+            'error':outcome['stderr'].strip()
+        }
+        for i,(case,outcome) in enumerate(zip(cases,outcomes))
+        if outcome['stderr'] or not outcome['passed']
+    ]
+    wall_times=[
+        round(outcome['wall_time']/1000,4) if outcome.get('wall_time') is not None else None
+        for outcome in outcomes
+    ]
+    measured=[wall_time for wall_time in wall_times if wall_time is not None]
+
+    if any(outcome.get('system_error') for outcome in outcomes):
+        validation_status='error'
+    else:
+        validation_status='failed' if mismatches else 'passed'
+    validation,_=ChallengeValidation.objects.update_or_create(
+        challenge=challenge,
+        language=language,
+        defaults={
+            'test_cases_version':challenge.test_cases_version,
+            'status':validation_status,
+            'passed':len(cases)-len(mismatches),
+            'total':len(cases),
+            'mismatches':mismatches,
+            'case_wall_times':wall_times,
+            'max_wall_time':max(measured) if measured else None
+        }
+    )
+    return validation
+
+
+# time_limit (whole seconds) that leaves JUDGE_TIME_LIMIT_HEADROOM times
+# the slowest reference test case, or None without timing data.
+def suggest_time_limit(validations):
+    measured=[validation.max_wall_time for validation in validations if validation.max_wall_time is not None]
+    if not measured:
+        return None
+    return max(1,math.ceil(max(measured)*settings.JUDGE_TIME_LIMIT_HEADROOM))
@@ -1,20 +1,44 @@
+import time
 from django.shortcuts import render
+from django.http import HttpResponse
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated
-from challenge.serializers import ChallengeSerializer,SubmissionSerializer,SubmissionListSerializer,SolutionSerializer,ChallengeCreateSerializer,ChallengeRequestSerializer
+from rest_framework.permissions import IsAuthenticated,AllowAny
+from challenge.serializers import CHALLENGE_CARD_FIELDS,ChallengeCardSerializer,ChallengeSerializer,SubmissionSerializer,SubmissionListSerializer,SubmissionTestResultSerializer,RejudgeJobSerializer,ChallengeValidationSerializer,SolutionSerializer,ChallengeCreateSerializer,ChallengeRequestSerializer
 from rest_framework.response import Response
 from rest_framework import status
-from challenge.models import Challenge,Submission,Solutions,ChallengeRequest
-import requests
-import json,time
-from challenge.utils import format_input_args,update_user_streak
-from django.db.models import Count,Avg
+from challenge.models import Challenge,Submission,Solutions,ChallengeRequest,RuntimeHistogram,RejudgeJob,UserChallengeProgress
+from challenge.admission import AdmissionDenied,admit,check_user_rate
+from challenge.harness import FILE_EXTENSIONS
+from challenge.lanes import LANE_QUEUES,get_lane
+from challenge.judge import run_test_cases,judge_submission,get_challenge_harness,select_harness_cases,store_challenge_harnesses,record_judging
+from challenge.metrics import render_metrics,render_node_status
+from challenge.executors import get_executor
+from challenge.result_cache import get_cached_results,cache_results
+from challenge.runtime_stats import get_faster_than,is_repeat_solution
+from challenge.rejudge import create_rejudge_job
+from challenge.tasks import judge_submission_task,rejudge_challenge_task,validate_challenge_task
+from challenge.validation import suggest_time_limit
+from challenge.utils import encode_cursor,decode_cursor
+from challenge.search import search_challenges
+from challenge.tags import sync_challenge_tags,facet_rows,cached_facet_rows,fold_facets
+from django.db.models import Count,Avg,Sum,Exists,OuterRef,Value,FloatField,IntegerField
+from django.db.models.functions import Coalesce
 from django.core.paginator import Paginator
 from accounts.models import User
 from notification.utils import send_system_notification
-from badge.utils import award_badges_on_submission
 from django.db.models import Q
 from django.utils import timezone
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+
+
+# 429 response for a run/submit turned away by admission control.
+def admission_denied_response(denied):
+    return Response(
+        {'error':str(denied)},
+        status=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={'Retry-After':str(denied.retry_after)}
+    )
 
 
 # Handles the creation of a new coding challenge. 
@@ -31,6 +55,10 @@ class ChallengeCreateView(APIView):
         serializer=ChallengeCreateSerializer(data=request.data)
         if serializer.is_valid():
             challenge=serializer.save()
+            store_challenge_harnesses(challenge)
+            sync_challenge_tags(challenge)
+            if settings.JUDGE_VALIDATE_ON_SAVE:
+                validate_challenge_task.delay(challenge.id)
 
             users=User.objects.all()
             send_system_notification(
@@ -58,20 +86,96 @@ class ChallengeUpdateView(APIView):
         challenge=Challenge.objects.get(id=id)
         serializer=ChallengeSerializer(challenge,data=request.data,partial=True)
         if serializer.is_valid():
-            serializer.save()
+            changed={
+                field for field in ('test_cases','function_signature','solution_code')
+                if field in serializer.validated_data and serializer.validated_data[field] != getattr(challenge,field)
+            }
+            # cached run results and verdicts are keyed by this version
+            if changed & {'test_cases','function_signature'}:
+                challenge.test_cases_version+=1
+            challenge=serializer.save()
+            store_challenge_harnesses(challenge)
+            sync_challenge_tags(challenge)
+            # only re-run the reference solutions when something they are
+            # checked against (or the solutions themselves) changed
+            if settings.JUDGE_VALIDATE_ON_SAVE and changed:
+                validate_challenge_task.delay(challenge.id)
             return Response({'message':'challenge updated successfully'},status=status.HTTP_200_OK)
         return Response(serializer.errors,status=status.HTTP_400_BAD_REQUEST)
         
 
 
 
-# Lists all challenges for the authenticated user.
-# Staff and superusers see all challenges with pagination;
-# regular users see only active challenges without pagination.
-# Also includes user-specific info: whether the user has completed it,
-# how many users completed it, and the challenge's success rate.
+# Re-judges the latest submission of every user and language of a
+# challenge against its current test cases (staff only), e.g. after the
+# test cases were fixed. GET returns the progress of the latest re-judge.
+class ChallengeRejudgeView(APIView):
+    permission_classes=[IsAuthenticated]
+
+    def post(self,request,id):
+        if not (request.user.is_staff or request.user.is_superuser):
+            return Response(
+                {'detail': 'You do not have permission to perform this action.'}, 
+                status=status.HTTP_403_FORBIDDEN
+            )
+        try:
+            challenge=Challenge.objects.get(id=id)
+        except Challenge.DoesNotExist:
+            return Response({'error':'Challenge not found'},status=status.HTTP_404_NOT_FOUND)
+        job=create_rejudge_job(challenge,requested_by=request.user)
+        rejudge_challenge_task.delay(job.id)
+        return Response(RejudgeJobSerializer(job).data,status=status.HTTP_202_ACCEPTED)
+
+    def get(self,request,id):
+        if not (request.user.is_staff or request.user.is_superuser):
+            return Response(
+                {'detail': 'You do not have permission to perform this action.'}, 
+                status=status.HTTP_403_FORBIDDEN
+            )
+        job=RejudgeJob.objects.filter(challenge_id=id).first()
+        if not job:
+            return Response({'error':'This challenge has not been re-judged'},status=status.HTTP_404_NOT_FOUND)
+        return Response(RejudgeJobSerializer(job).data,status=status.HTTP_200_OK)
+
+
+# Returns the latest validation of each language's reference solution
+# against the challenge's test cases (staff only), with the time_limit
+# the measured timings suggest.
+class ChallengeValidationView(APIView):
+    permission_classes=[IsAuthenticated]
+
+    def get(self,request,id):
+        if not (request.user.is_staff or request.user.is_superuser):
+            return Response(
+                {'detail': 'You do not have permission to perform this action.'}, 
+                status=status.HTTP_403_FORBIDDEN
+            )
+        try:
+            challenge=Challenge.objects.get(id=id)
+        except Challenge.DoesNotExist:
+            return Response({'error':'Challenge not found'},status=status.HTTP_404_NOT_FOUND)
+        validations=list(challenge.validations.all())
+        return Response({
+            'test_cases_version':challenge.test_cases_version,
+            'time_limit':challenge.time_limit,
+            'suggested_time_limit':suggest_time_limit(validations),
+            'validations':ChallengeValidationSerializer(validations,many=True).data
+        },status=status.HTTP_200_OK)
+
+
+# Lists all challenges for the authenticated user in a fixed number of
+# queries: whether the user has completed each challenge and its stats
+# (ChallengeStats) are annotated onto the challenge query.
+# `search` results are ranked (see challenge.search), otherwise newest
+# challenges come first; `tag` keeps challenges carrying that exact tag.
+# Staff and superusers see all challenges in full (ChallengeSerializer,
+# the admin edit form is filled from these rows) with page/page_size
+# pagination; regular users see only active challenges as lean cards
+# (ChallengeCardSerializer), all at once or, when `limit` or `cursor` is
+# given, in keyset pages with `next_cursor`.
 class ChallengeListView(APIView):
     permission_classes=[IsAuthenticated]
+    max_limit=100
 
     def get(self,request):
         user=request.user
@@ -88,18 +192,31 @@ class ChallengeListView(APIView):
             challenges=Challenge.objects.filter(is_active=True)
         
         if search_query:
-            challenges=challenges.filter(
-                Q(title__icontains=search_query)
-            )
+            challenges=search_challenges(challenges,search_query)
         
         if difficulty_filter and difficulty_filter.lower() != 'all':
             challenges=challenges.filter(difficulty__iexact=difficulty_filter)
         
         if tag_filter and tag_filter.lower() !='all':
-            challenges=challenges.filter(tags__icontains=tag_filter)
+            challenges=challenges.filter(tags__contains=[tag_filter])
         
-        challenges=challenges.order_by('-created_at')
-
+        ordering=['-created_at','-id']
+        if search_query:
+            ordering.insert(0,'-rank')
+        if is_admin:
+            challenges=challenges.defer('search_vector')
+        else:
+            challenges=challenges.only(*CHALLENGE_CARD_FIELDS)
+        challenges=challenges.annotate(
+            is_completed=Exists(
+                UserChallengeProgress.objects.filter(user=user,challenge=OuterRef('pk'),first_solved_at__isnull=False)
+            ),
+            success_rate=Coalesce('stats__success_rate',Value(0.0),output_field=FloatField()),
+            completed_users=Coalesce('stats__solvers',Value(0),output_field=IntegerField())
+        ).order_by(*ordering)
+
+        next_cursor=None
+        keyset='limit' in request.GET or 'cursor' in request.GET
         if is_admin:
             page=int(request.GET.get('page',1))
             page_size=int(request.GET.get('page_size',10))
@@ -107,38 +224,91 @@ class ChallengeListView(APIView):
             page_obj=paginator.get_page(page)
             paginated_challenges=page_obj.object_list
             total_count = paginator.count
+        elif keyset:
+            try:
+                limit=min(max(int(request.GET.get('limit',20)),1),self.max_limit)
+            except ValueError:
+                return Response({'error':'limit must be a number'},status=status.HTTP_400_BAD_REQUEST)
+            cursor=request.GET.get('cursor')
+            if cursor:
+                position=decode_cursor(cursor)
+                if position is None:
+                    return Response({'error':'invalid cursor'},status=status.HTTP_400_BAD_REQUEST)
+                created_at,last_id,rank=position
+                after=Q(created_at__lt=created_at)|Q(created_at=created_at,id__lt=last_id)
+                if search_query:
+                    if rank is None:
+                        return Response({'error':'invalid cursor'},status=status.HTTP_400_BAD_REQUEST)
+                    after=Q(rank__lt=rank)|(Q(rank=rank)&after)
+                challenges=challenges.filter(after)
+            paginated_challenges=list(challenges[:limit+1])
+            if len(paginated_challenges) > limit:
+                paginated_challenges=paginated_challenges[:limit]
+                last=paginated_challenges[-1]
+                next_cursor=encode_cursor(last.created_at,last.id,getattr(last,'rank',None))
         else:
-            paginated_challenges=challenges
-            total_count = challenges.count()
+            paginated_challenges=list(challenges)
+            total_count = len(paginated_challenges)
 
-        challenge_list=[]
-
-        for challenge in paginated_challenges:
-            is_completed=Submission.objects.filter(user=user,challenge=challenge,is_completed=True).exists()
-            total_attempts=Submission.objects.filter(challenge=challenge).count()
-            completed_users_count=Submission.objects.filter(challenge=challenge,is_completed=True).values('user').distinct().count()
-            if total_attempts > 0:
-                success_rate=round((completed_users_count/total_attempts)*100,2)
-            else:
-                success_rate=0.0
-            serializer=ChallengeSerializer(challenge,context={'request':request})
-            challenge_data=serializer.data
-            challenge_data['is_completed']=is_completed
-            challenge_data['success_rate']=success_rate
-            challenge_data['completed_users']=completed_users_count
+        if is_admin:
+            results=[]
+            for challenge in paginated_challenges:
+                challenge_data=ChallengeSerializer(challenge,context={'request':request}).data
+                challenge_data['is_completed']=challenge.is_completed
+                challenge_data['success_rate']=challenge.success_rate
+                challenge_data['completed_users']=challenge.completed_users
+                results.append(challenge_data)
+        else:
+            results=ChallengeCardSerializer(paginated_challenges,many=True).data
 
-            challenge_list.append(challenge_data)
+        response={
+            'results':results,
+            'search_query':search_query,
+            'applied_filters': {
+                'difficulty': difficulty_filter,
+                'tag': tag_filter
+            }
+        }
+        if keyset and not is_admin:
+            response['next_cursor']=next_cursor
+        else:
+            response['count']=total_count
+        return Response(response,status=status.HTTP_200_OK)
         
+
+
+# Tag and difficulty counts (facets) of the active challenges for the
+# same `search`, `difficulty` and `tag` filters as ChallengeListView, in
+# one query: read from the ChallengeFacetCount cache, or aggregated over
+# the search results when searching.
+class ChallengeFacetView(APIView):
+    permission_classes=[IsAuthenticated]
+
+    def get(self,request):
+        search_query=request.GET.get('search','').strip()
+        difficulty_filter=request.GET.get('difficulty','').strip()
+        tag_filter=request.GET.get('tag','').strip()
+
+        if search_query:
+            rows=facet_rows(search_challenges(Challenge.objects.filter(is_active=True),search_query))
+        else:
+            rows=cached_facet_rows()
+        facets=fold_facets(
+            rows,
+            difficulty=difficulty_filter.lower() if difficulty_filter.lower() not in ('','all') else None,
+            tag=tag_filter if tag_filter.lower() not in ('','all') else None
+        )
+        tags=sorted(facets['tags'].items(),key=lambda item: (-item[1],item[0]))
+
         return Response({
-            'results':challenge_list,
-            'count':total_count,
+            'tags':[{'name':name,'count':count} for name,count in tags],
+            'difficulties':facets['difficulties'],
             'search_query':search_query,
             'applied_filters': {
                 'difficulty': difficulty_filter,
                 'tag': tag_filter
             }
         },status=status.HTTP_200_OK)
-        
 
 
 # Allows staff/superusers to activate or deactivate a challenge
@@ -162,6 +332,7 @@ class ChallengeBlockView(APIView):
             return Response({'error':'is_active field is required'},status=status.HTTP_400_BAD_REQUEST)
         challenge.is_active=is_active
         challenge.save()
+        sync_challenge_tags(challenge)
         return Response({'message':'Challenge Status Updated Successfully'},status=status.HTTP_200_OK)
 
 
@@ -181,13 +352,11 @@ class ChallengeDetailView(APIView):
             return Response({'detail':'challenge not Found'},status=status.HTTP_404_NOT_FOUND)
 
 
-PISTON_URL = "https://emkc.org/api/v2/piston/execute"
-
-
-
 # Executes the user's code against all **visible** test cases
-# using the Piston code execution API.
+# using the configured code executor (Piston or local).
 # Returns the result of each test case with a summary of passed tests.
+# Results are cached per code/language/test case version, so re-running
+# unchanged code does not execute it again.
 class RunChallengeView(APIView):
     permission_classes=[IsAuthenticated]
 
@@ -201,90 +370,38 @@ class RunChallengeView(APIView):
         except Challenge.DoesNotExist:
             return Response({'error':'Challenge not found'},status=status.HTTP_404_NOT_FOUND)
         
+        if language not in FILE_EXTENSIONS:
+            return Response({'error':'unsupported language'},status=status.HTTP_400_BAD_REQUEST)
         
         # function_name = challenge.function_signature.strip().split('(')[0].replace("def", "").strip()
         function_name = challenge.function_signature.strip()
-        visible_cases = [tc for tc in challenge.test_cases if not tc["hidden"]]
+        visible_indexes = [i for i,tc in enumerate(challenge.test_cases) if not tc["hidden"]]
+        visible_cases = [challenge.test_cases[i] for i in visible_indexes]
         console_output=[]
         passed=0
         total=len(visible_cases)
 
-        for i,case in enumerate(visible_cases):
-            input_args = format_input_args(case['input'], language)
-            func_call=''
-            if language == 'python':
-                func_call = f"\nprint({function_name}({input_args}))" 
-                final_code=code.strip() + "\n" + func_call
-            elif language == 'javascript':
-                func_call=f"\nconsole.log({function_name}({input_args}))"
-                final_code=code.strip() + "\n" + func_call
-            elif language == 'cpp':
-                final_code=f"""
-#include <iostream>
-using namespace std;
-
-{code.strip()}
-
-int main() {{
-    cout << {function_name}({input_args});
-    return 0;
-}}
-"""
-            elif language == 'java':
-                final_code=f"""
-{code.strip()}
-
-class Main {{
-    public static void main(String[] args) {{
-        System.out.println({function_name}({input_args}));
-    }}
-}}
-"""
-            elif language=='c':
-                final_code=f"""
-#include <stdio.h>
-
-{code.strip()}
-
-int main() {{
-    printf("%d", {function_name}({input_args}));
-    return 0;
-}}
-"""
-            else:
-                return Response({'error':'unsupported language'},status=status.HTTP_400_BAD_REQUEST)
-            data={
-                'language':language,
-                "version": "*",
-                "files": [
-                    {
-                        "name": "main." + (
-                            'py' if language == 'python' else
-                            'js' if language == 'javascript' else
-                            'cpp' if language == 'cpp' else
-                            'java' if language == 'java' else
-                            'c'
-                        ), 
-                        "content": final_code
-                    }
-                ]
-            }
-            piston_res=requests.post(PISTON_URL,json=data)
-            result=piston_res.json()
-
-            # actual_output = result.get('run', {}).get('stdout', '').strip().lower()
-            # expected_output=case['output'].strip().lower()
-            # stderr = result.get('run', {}).get('stderr', '') or result.get('compile', {}).get('stderr', '')
-            actual_output_raw = result.get('run', {}).get('stdout', '').strip()
-            expected_output_raw = case['output'].strip()
-            stderr = result.get('run', {}).get('stderr', '') or result.get('compile', {}).get('stderr', '')
-
+        cached=get_cached_results('run',challenge,code,language)
+        if cached:
+            outcomes=cached['outcomes']
+        else:
             try:
-                actual_parsed = json.loads(actual_output_raw)
-                expected_parsed = json.loads(expected_output_raw)
-                is_passed = actual_parsed == expected_parsed
-            except Exception:
-                is_passed = actual_output_raw.lower() == expected_output_raw.lower()
+                with admit(request.user.id,language,get_lane(request.user,challenge,is_run=True)):
+                    start_time=time.time()
+                    outcomes=run_test_cases(
+                        code,language,function_name,visible_cases,
+                        harness=select_harness_cases(get_challenge_harness(challenge,language),visible_indexes)
+                    )
+                    record_judging('run',challenge,language,outcomes,time.time()-start_time)
+            except AdmissionDenied as denied:
+                return admission_denied_response(denied)
+            cache_results('run',challenge,code,language,outcomes)
+
+        for i,(case,outcome) in enumerate(zip(visible_cases,outcomes)):
+            actual_output_raw = outcome['stdout']
+            expected_output_raw = case['output'].strip()
+            stderr = outcome['stderr']
+            is_passed = outcome['passed']
 
             if stderr:
                 console_output.append({
@@ -332,6 +449,9 @@ int main() {{
 # Code is executed against **all** test cases (visible + hidden).
 # Awards XP only if the user is completing the challenge for the first time.
 # Saves the submission and updates the user's XP and progress.
+# With JUDGE_USE_QUEUE enabled the submission is only recorded as pending
+# here and judged by a Celery worker, which reports progress over websockets.
+# Queued or not, it is judged in its priority lane (challenge.lanes).
 class SubmitChallengeView(APIView):
     permission_classes=[IsAuthenticated]
 
@@ -348,196 +468,81 @@ class SubmitChallengeView(APIView):
             except Challenge.DoesNotExist:
                 return Response({'error':'Challenge not found'},status=status.HTTP_404_NOT_FOUND)
             
-            already_completed=Submission.objects.filter(user=user,challenge=challenge,is_completed=True).exists()
-            
-            function_name=challenge.function_signature.strip()
-            visible_cases=[tc for tc in challenge.test_cases]
-            console_output=[]
-            passed=0
-            total=len(visible_cases)
-            failed_hidden_cases=[]
-
-            start_time=time.time()
-
-            for i,case in enumerate(visible_cases):
-                input_args = format_input_args(case['input'], language)
-                func_call=''
-                if language == 'python':
-                    func_call = f"\nprint({function_name}({input_args}))" 
-                    final_code=code.strip() + "\n" + func_call
-                elif language == 'javascript':
-                    func_call=f"\nconsole.log({function_name}({input_args}))"
-                    final_code=code.strip() + "\n" + func_call
-                elif language == 'cpp':
-                    final_code=f"""
-                        #include <iostream>
-                        using namespace std;
-
-                        {code.strip()}
-
-                        int main() {{
-                            cout << {function_name}({input_args});
-                            return 0;
-                        }}
-                        """
-                elif language == 'java':
-                    final_code=f"""
-                        {code.strip()}
-
-                        class Main {{
-                            public static void main(String[] args) {{
-                                System.out.println({function_name}({input_args}));
-                            }}
-                        }}
-                        """
-                elif language=='c':
-                    final_code=f"""
-                        #include <stdio.h>
-
-                        {code.strip()}
-
-                        int main() {{
-                            printf("%d", {function_name}({input_args}));
-                            return 0;
-                        }}
-                        """
-                else:
-                    return Response({'error':'unsupported language'},status=status.HTTP_400_BAD_REQUEST)
-                
-                data={
-                    'language':language,
-                    'version':'*',
-                    "files": [
-                        {
-                            "name": "main." + (
-                                'py' if language == 'python' else
-                                'js' if language == 'javascript' else
-                                'cpp' if language == 'cpp' else
-                                'java' if language == 'java' else
-                                'c'
-                            ), 
-                            "content": final_code
-                        }
-                    ]
-                }
-                piston_res=requests.post(PISTON_URL,json=data)
-                result=piston_res.json()
-
-                # actual_output = result.get('run', {}).get('stdout', '').strip().lower()
-                # expected_output=case['output'].strip().lower()
-                # stderr = result.get('run', {}).get('stderr', '') or result.get('compile', {}).get('stderr', '')
-
-                actual_output_raw = result.get('run', {}).get('stdout', '').strip()
-                expected_output_raw = case['output'].strip()
-                stderr = result.get('run', {}).get('stderr', '') or result.get('compile', {}).get('stderr', '')
-
-                try:
-                    actual_parsed = json.loads(actual_output_raw)
-                    expected_parsed = json.loads(expected_output_raw)
-                    is_passed = actual_parsed == expected_parsed
-                except Exception:
-                    is_passed = actual_output_raw.lower() == expected_output_raw.lower()
-
-
-                if stderr:
-                    if case.get('hidden'):
-                        failed_hidden_cases.append({
-                            'input':input_args,
-                            'error':stderr.strip()
-                        })
-                    continue
-
-                if is_passed:
-                    passed+=1
-                    console_output.append({
-                        'type': 'success',
-                        'message': f"Test Case {i + 1} {'(Hidden)' if case.get('hidden') else ''}: PASSED"
-                    })
-                else:
-                    if case.get('hidden'):
-                        failed_hidden_cases.append({
-                            'input':input_args,
-                            'actual':actual_output_raw,
-                            'expected':expected_output_raw
-                        })
-                    console_output.append({
-                        'type': 'error',
-                        'message': f"Test Case {i + 1} {'(Hidden)' if case.get('hidden') else ''}: FAILED",
-                        'details': {
-                            'input':input_args,
-                            'actual':actual_output_raw,
-                            'expected':expected_output_raw
-                        }
-                    })
+            if language not in FILE_EXTENSIONS:
+                return Response({'error':'unsupported language'},status=status.HTTP_400_BAD_REQUEST)
             
-            end_time=time.time()
-            runtime=round(end_time-start_time,2)
-
-            is_completed=passed==total
-
-            xp_awarded=challenge.xp_reward if is_completed and not already_completed else 0
-
-            submission=Submission.objects.create(
-                user=user,
-                challenge=challenge,
-                code=code,
-                language=language,
-                is_completed=is_completed,
-                passed_test_cases=passed,
-                total_test_cases=total,
-                runtime=runtime,
-                xp_awarded=xp_awarded
+            if settings.JUDGE_USE_QUEUE:
+                # the worker pool bounds concurrency; only the user's rate applies
+                if settings.JUDGE_ADMISSION_ENABLED:
+                    try:
+                        check_user_rate(user.id)
+                    except AdmissionDenied as denied:
+                        return admission_denied_response(denied)
+                submission=Submission.objects.create(
+                    user=user,
+                    challenge=challenge,
+                    code=code,
+                    language=language,
+                    total_test_cases=len(challenge.test_cases),
+                    status='pending'
                 )
-            
-            if xp_awarded:
-                user.xp +=xp_awarded
-                user.save()
-                update_user_streak(user)
-            
-            award_badges_on_submission(submission)
-            
-            console_output.append({
-                'type':'info',
-                'message':f"{passed}/{total} test cases passed"
-            })
+                lane=get_lane(user,challenge)
+                judge_submission_task.apply_async((submission.id,),{'lane':lane},queue=LANE_QUEUES[lane])
+                return Response({
+                    'submission_id':submission.id,
+                    'status':submission.status
+                },status=status.HTTP_202_ACCEPTED)
+
+            submission=Submission(user=user,challenge=challenge,code=code,language=language)
+            try:
+                with admit(user.id,language,get_lane(user,challenge)):
+                    result=judge_submission(submission)
+            except AdmissionDenied as denied:
+                return admission_denied_response(denied)
+            return Response(result,status=status.HTTP_200_OK)
 
-            if xp_awarded:
-                console_output.append({
-                    'type': 'success',
-                    'message': f"🎉 {xp_awarded} XP awarded!"
-                })
-            elif is_completed and already_completed:
-                console_output.append({
-                    'type': 'warning',
-                    'message': "You already completed this challenge."
-                })
-            elif not is_completed:
-                console_output.append({
-                    'type': 'error',
-                    'message': "Challenge failed. Try fixing the issues above and submit again."
-                })
-            
-            for error in failed_hidden_cases:
-                console_output.append({
-                    'type': 'error',
-                    'message': 'Hidden Test Case Failed',
-                    'details': error
-                })
-            
-            attempts = Submission.objects.filter(user=user, challenge=challenge).count()     
-            summary={
-                'passed':passed,
-                'total':total,
-                'is_completed':is_completed,
-                'xp_awarded':xp_awarded,
-                'already_completed':already_completed,
-                'attempts':attempts
-            }
 
-            return Response({
-                'console_output':console_output,
-                'result_summary':summary
-            },status=status.HTTP_200_OK)
+# Returns the state of a single submission of the authenticated user.
+# Used to poll queued submissions; `result` holds the console output
+# and summary and `test_results` the per-case metrics once judging has finished.
+class SubmissionStatusView(APIView):
+    permission_classes=[IsAuthenticated]
+
+    def get(self,request,submission_id):
+        try:
+            submission=Submission.objects.get(id=submission_id,user=request.user)
+        except Submission.DoesNotExist:
+            return Response({'error':'Submission not found'},status=status.HTTP_404_NOT_FOUND)
+        return Response({
+            'submission_id':submission.id,
+            'status':submission.status,
+            'result':submission.result,
+            'test_results':SubmissionTestResultSerializer(submission.test_results.all(),many=True).data
+        },status=status.HTTP_200_OK)
+
+
+# Returns how an accepted submission's runtime compares with every other
+# accepted submission to the same challenge in the same language
+# ("faster than X%"), read from the precomputed runtime histogram.
+class SubmissionPercentileView(APIView):
+    permission_classes=[IsAuthenticated]
+
+    def get(self,request,submission_id):
+        try:
+            submission=Submission.objects.get(id=submission_id,user=request.user)
+        except Submission.DoesNotExist:
+            return Response({'error':'Submission not found'},status=status.HTTP_404_NOT_FOUND)
+        if not submission.is_completed or submission.runtime is None:
+            return Response({'error':'Only accepted submissions have a runtime percentile'},status=status.HTTP_400_BAD_REQUEST)
+
+        histogram=RuntimeHistogram.objects.filter(challenge_id=submission.challenge_id,language=submission.language).first()
+        return Response({
+            'submission_id':submission.id,
+            'language':submission.language,
+            'runtime':submission.runtime,
+            'faster_than':get_faster_than(histogram,submission.runtime,recorded=not is_repeat_solution(submission)) if histogram else None,
+            'accepted_submissions':histogram.total if histogram else 0
+        },status=status.HTTP_200_OK)
 
 
 # Retrieves all past submissions of the authenticated user 
@@ -636,18 +641,19 @@ class UserDomainStatsView(APIView):
     def get(self,request):
         user=request.user
 
-        total_submissions=Submission.objects.filter(user=user).count()
-        completed_challenge_ids=Submission.objects.filter(user=user,is_completed=True).values_list('challenge_id',flat=True).distinct()
-
-        total_completed=completed_challenge_ids.count()
-
-        challenges=Challenge.objects.filter(id__in=completed_challenge_ids)
-
-        completed_dict = {
-            'easy': challenges.filter(difficulty='easy').count(),
-            'medium': challenges.filter(difficulty='medium').count(),
-            'hard': challenges.filter(difficulty='hard').count(),
-        }
+        progress=UserChallengeProgress.objects.filter(user=user)
+        total_submissions=progress.aggregate(total=Sum('attempts'))['total'] or 0
+        completed_by_difficulty=(
+            progress.filter(first_solved_at__isnull=False)
+            .values('challenge__difficulty')
+            .annotate(count=Count('id'))
+        )
+        completed_dict = {'easy': 0, 'medium': 0, 'hard': 0}
+        total_completed=0
+        for item in completed_by_difficulty:
+            total_completed+=item['count']
+            if item['challenge__difficulty'] in completed_dict:
+                completed_dict[item['challenge__difficulty']]=item['count']
         
         total_challenges=Challenge.objects.values('difficulty').annotate(count=Count('id'))
         total_dict = {"easy": 0, "medium": 0, "hard": 0}
@@ -758,21 +764,37 @@ class TimeLimitedChallengesView(APIView):
 
     def get(self,request):
         now=timezone.now()
-        challenge=Challenge.objects.filter(start_time__isnull=False,end_time__isnull=False,start_time__lte=now,end_time__gte=now).order_by('-start_time').first()
+        challenge=Challenge.objects.filter(start_time__isnull=False,end_time__isnull=False,start_time__lte=now,end_time__gte=now).select_related('stats').order_by('-start_time').first()
         if challenge:
             serializer=ChallengeSerializer(challenge)
             challenge_data=serializer.data
 
-            total_attempts=Submission.objects.filter(challenge=challenge).count()
-            completed_users_count=Submission.objects.filter(challenge=challenge,is_completed=True).values('user').distinct().count()
-            if total_attempts > 0:
-                success_rate=round((completed_users_count/total_attempts)*100,2)
-            else:
-                success_rate=0.0
-            
-            challenge_data['success_rate']=success_rate
+            stats=getattr(challenge,'stats',None)
+            challenge_data['success_rate']=stats.success_rate if stats else 0.0
 
             return Response(challenge_data)
         else:
             return Response({'message':'coming soon'},status=status.HTTP_200_OK)
 
+
+
+# Judge telemetry (challenge.metrics) in the Prometheus text format,
+# followed by this process's view of the executor nodes' health.
+# Open to staff and to scrapers that send JUDGE_METRICS_TOKEN in the
+# X-Metrics-Token header.
+class JudgeMetricsView(APIView):
+    permission_classes=[AllowAny]
+
+    def get(self,request):
+        token=settings.JUDGE_METRICS_TOKEN
+        has_token=bool(token) and constant_time_compare(request.headers.get('X-Metrics-Token',''),token)
+        if not (has_token or request.user.is_staff or request.user.is_superuser):
+            return Response(
+                {'detail': 'You do not have permission to perform this action.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        body=render_metrics()
+        if body is None:
+            return Response({'error':'Metrics are unavailable'},status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        body+=render_node_status(get_executor().status())
+        return HttpResponse(body,content_type='text/plain; version=0.0.4; charset=utf-8')
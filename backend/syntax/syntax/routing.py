@@ -1,5 +1,6 @@
 from django.urls import re_path
 from chat.routing import websocket_urlpatterns as chat_ws
 from notification.routing import websocket_urlpatterns as notification_ws
+from challenge.routing import websocket_urlpatterns as challenge_ws
 
-websocket_urlpatterns=chat_ws+notification_ws
\ No newline at end of file
+websocket_urlpatterns=chat_ws+notification_ws+challenge_ws
\ No newline at end of file
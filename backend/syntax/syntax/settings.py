@@ -12,7 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import cloudinary
-from decouple import config
+from decouple import config,Csv
 from datetime import timedelta
 # from decouple
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     'rest_framework',
     'rest_framework_simplejwt',
@@ -247,5 +248,141 @@ RAZORPAY_KEY_SECRET=config('RAZORPAY_KEY_SECRET')
 
 
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'judge': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('JUDGE_CACHE_URL', default='redis://redis:6379/1'),
+        'TIMEOUT': config('JUDGE_RESULT_CACHE_TTL', cast=int, default=60*60),
+    },
+}
+
+
+
 CELERY_BROKER_URL = 'redis://redis:6379/0'
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
+# Queued submissions are sent to a per-lane judge queue (challenge.lanes.LANE_QUEUES);
+# "judge" is the standard lane.
+CELERY_TASK_ROUTES = {
+    'challenge.tasks.judge_submission_task': {'queue': 'judge'},
+    'challenge.tasks.validate_challenge_task': {'queue': 'judge'},
+}
+# Re-judge chunks are rate limited per worker so bulk re-judges never crowd out live judging.
+CELERY_TASK_ANNOTATIONS = {
+    'challenge.tasks.rejudge_chunk_task': {'rate_limit': config('JUDGE_REJUDGE_RATE_LIMIT', default='12/m')},
+}
+
+
+
+# Code execution / judging.
+# JUDGE_EXECUTOR selects where code runs: "piston" (PISTON_URLS, public or
+# self-hosted). "local" (subprocesses on this host, limited by the
+# JUDGE_LOCAL_* settings) is refused until local runs are sandboxed, since
+# submissions could read this process's secrets.
+JUDGE_EXECUTOR=config('JUDGE_EXECUTOR', default='piston')
+PISTON_URL=config('PISTON_URL', default='https://emkc.org/api/v2/piston/execute')
+# Comma-separated Piston nodes to balance across; a node is ejected for
+# PISTON_EJECTION_SECONDS after PISTON_FAILURE_THRESHOLD consecutive failures.
+PISTON_URLS=config('PISTON_URLS', default=PISTON_URL, cast=Csv())
+PISTON_FAILURE_THRESHOLD=config('PISTON_FAILURE_THRESHOLD', cast=int, default=3)
+PISTON_EJECTION_SECONDS=config('PISTON_EJECTION_SECONDS', cast=int, default=30)
+# Each Piston request is bounded by these timeouts (seconds) and retried on
+# another node up to PISTON_MAX_RETRIES times, with jittered exponential
+# backoff starting at PISTON_RETRY_BACKOFF. PISTON_HEDGE_REQUESTS sends a
+# duplicate request when the first one outlives the recent p95 latency.
+PISTON_CONNECT_TIMEOUT=config('PISTON_CONNECT_TIMEOUT', cast=float, default=3.05)
+PISTON_READ_TIMEOUT=config('PISTON_READ_TIMEOUT', cast=float, default=20)
+PISTON_MAX_RETRIES=config('PISTON_MAX_RETRIES', cast=int, default=2)
+PISTON_RETRY_BACKOFF=config('PISTON_RETRY_BACKOFF', cast=float, default=0.2)
+PISTON_HEDGE_REQUESTS=config('PISTON_HEDGE_REQUESTS', cast=bool, default=False)
+JUDGE_LOCAL_WORKDIR=config('JUDGE_LOCAL_WORKDIR', default='/tmp/syntax-judge')
+JUDGE_LOCAL_CPU_SECONDS=config('JUDGE_LOCAL_CPU_SECONDS', cast=int, default=2)
+JUDGE_LOCAL_WALL_SECONDS=config('JUDGE_LOCAL_WALL_SECONDS', cast=int, default=5)
+JUDGE_LOCAL_COMPILE_SECONDS=config('JUDGE_LOCAL_COMPILE_SECONDS', cast=int, default=15)
+JUDGE_LOCAL_MEMORY_MB=config('JUDGE_LOCAL_MEMORY_MB', cast=int, default=256)
+JUDGE_LOCAL_OUTPUT_BYTES=config('JUDGE_LOCAL_OUTPUT_BYTES', cast=int, default=1024*1024)
+# RLIMIT_NPROC of local programs; it counts all processes and threads of the
+# judge's user, so leave room for the JVM's threads and the judge itself.
+JUDGE_LOCAL_MAX_PROCESSES=config('JUDGE_LOCAL_MAX_PROCESSES', cast=int, default=128)
+# Executors hand at most JUDGE_MAX_OUTPUT_SIZE characters of stdout/stderr
+# to the judge (the rest is cut with a truncation marker); Piston responses
+# larger than JUDGE_MAX_RESPONSE_BYTES are rejected as "Output limit exceeded".
+JUDGE_MAX_OUTPUT_SIZE=config('JUDGE_MAX_OUTPUT_SIZE', cast=int, default=64*1024)
+JUDGE_MAX_RESPONSE_BYTES=config('JUDGE_MAX_RESPONSE_BYTES', cast=int, default=1024*1024)
+# Compiled C/C++/Java programs are cached here (LRU, by entry count) when
+# judging with the local executor, so each submission compiles only once.
+JUDGE_ARTIFACT_CACHE_DIR=config('JUDGE_ARTIFACT_CACHE_DIR', default='/tmp/syntax-judge-artifacts')
+JUDGE_ARTIFACT_CACHE_SIZE=config('JUDGE_ARTIFACT_CACHE_SIZE', cast=int, default=500)
+# Run results larger than this are not cached (see challenge.result_cache);
+# the overall memory cap is the Redis maxmemory setting in docker-compose.
+JUDGE_RESULT_CACHE_MAX_ENTRY_BYTES=config('JUDGE_RESULT_CACHE_MAX_ENTRY_BYTES', cast=int, default=64*1024)
+# Precomputed per-language harnesses of each challenge (challenge.judge.get_challenge_harness),
+# kept in the "judge" cache and in a per-process LRU of JUDGE_HARNESS_LOCAL_CACHE_SIZE entries.
+JUDGE_HARNESS_CACHE_TTL=config('JUDGE_HARNESS_CACHE_TTL', cast=int, default=7*24*60*60)
+JUDGE_HARNESS_LOCAL_CACHE_SIZE=config('JUDGE_HARNESS_LOCAL_CACHE_SIZE', cast=int, default=256)
+
+# "sequential" runs one execution per test case,
+# "concurrent" runs the per-case executions in parallel (bounded by JUDGE_MAX_CONCURRENCY),
+# "batch" runs the test cases of a request inside generated programs of
+# JUDGE_BATCH_SIZE cases each (0 = all in one), batches in parallel.
+# A batch shares one execution's time limit, so a slow but valid solution
+# that fits the limit per case can time out as a batch: keep batches small
+# enough that JUDGE_BATCH_SIZE cases fit the executor's run timeout.
+JUDGE_EXECUTION_MODE=config('JUDGE_EXECUTION_MODE', default='sequential')
+JUDGE_MAX_CONCURRENCY=config('JUDGE_MAX_CONCURRENCY', cast=int, default=8)
+JUDGE_BATCH_SIZE=config('JUDGE_BATCH_SIZE', cast=int, default=10)
+# "literal" splices each test input into the program source,
+# "stdin" runs one program per challenge that reads JSON arguments from
+# stdin (falls back to "literal" for inputs that are not plain JSON).
+JUDGE_ARGUMENT_PROTOCOL=config('JUDGE_ARGUMENT_PROTOCOL', default='literal')
+# Submissions stop being judged after this many failed test cases and the
+# rest are reported as "not run" (0 = always run every case).
+# Challenge.fail_fast_after overrides it per challenge.
+JUDGE_FAIL_FAST_AFTER=config('JUDGE_FAIL_FAST_AFTER', cast=int, default=0)
+
+# When enabled, submissions are saved as pending and judged by the
+# Celery "judge" queue instead of inside the HTTP request.
+JUDGE_USE_QUEUE=config('JUDGE_USE_QUEUE', cast=bool, default=False)
+
+# Admission control for run/submit (challenge.admission): each user gets a
+# token bucket of JUDGE_USER_BURST executions refilled at JUDGE_USER_RATE
+# per second, and each language at most JUDGE_LANGUAGE_CONCURRENCY inline
+# executions across all web processes. Rejected requests get a 429.
+JUDGE_ADMISSION_ENABLED=config('JUDGE_ADMISSION_ENABLED', cast=bool, default=True)
+JUDGE_ADMISSION_REDIS_URL=config('JUDGE_ADMISSION_REDIS_URL', default='redis://redis:6379/2')
+JUDGE_USER_RATE=config('JUDGE_USER_RATE', cast=float, default=0.5)
+JUDGE_USER_BURST=config('JUDGE_USER_BURST', cast=int, default=5)
+JUDGE_LANGUAGE_CONCURRENCY=config('JUDGE_LANGUAGE_CONCURRENCY', cast=int, default=16)
+JUDGE_ADMISSION_LEASE_SECONDS=config('JUDGE_ADMISSION_LEASE_SECONDS', cast=int, default=120)
+JUDGE_ADMISSION_RETRY_SECONDS=config('JUDGE_ADMISSION_RETRY_SECONDS', cast=int, default=2)
+# Share of a language's slots each lane (challenge.lanes) may fill; lower
+# lanes are turned away earlier so premium and contest work keeps headroom.
+JUDGE_LANE_SLOT_SHARES={
+    'premium':1.0,
+    'contest':1.0,
+    'standard':0.8,
+    'run':0.6,
+    'rejudge':0.25,
+}
+# Slots of each language reserved for each lane, so steady higher-lane load
+# cannot starve the lower lanes; keep their sum below JUDGE_LANGUAGE_CONCURRENCY.
+JUDGE_LANE_SLOT_RESERVATIONS={
+    'premium':2,
+    'contest':2,
+    'standard':2,
+    'run':1,
+    'rejudge':1,
+}
+# Bulk re-judges (challenge.rejudge) run in chunks of about this many submissions.
+JUDGE_REJUDGE_CHUNK_SIZE=config('JUDGE_REJUDGE_CHUNK_SIZE', cast=int, default=25)
+# Reference solutions are validated when a challenge is created or updated;
+# the suggested time_limit leaves this factor over the slowest test case.
+JUDGE_VALIDATE_ON_SAVE=config('JUDGE_VALIDATE_ON_SAVE', cast=bool, default=True)
+JUDGE_TIME_LIMIT_HEADROOM=config('JUDGE_TIME_LIMIT_HEADROOM', cast=float, default=3.0)
+# Judge telemetry (challenge.metrics), served at /challenge/metrics/ to
+# staff and to scrapers sending JUDGE_METRICS_TOKEN as X-Metrics-Token.
+JUDGE_METRICS_ENABLED=config('JUDGE_METRICS_ENABLED', cast=bool, default=True)
+JUDGE_METRICS_REDIS_URL=config('JUDGE_METRICS_REDIS_URL', default=JUDGE_ADMISSION_REDIS_URL)
+JUDGE_METRICS_TOKEN=config('JUDGE_METRICS_TOKEN', default='')